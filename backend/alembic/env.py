@@ -17,6 +17,7 @@ from app.models.base import Base
 from app.models.task import Task
 from app.models.activity import Activity
 from app.models.comment import Comment
+from app.models.tombstone import TaskTombstone
 from app.core.config import get_settings
 
 target_metadata = Base.metadata
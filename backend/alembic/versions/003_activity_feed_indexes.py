@@ -0,0 +1,24 @@
+"""activity feed keyset indexes
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_activities_task_id_activity_seq', 'activities', ['task_id', 'activity_seq'], unique=False)
+    op.create_index('ix_activities_created_at_id', 'activities', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_activities_created_at_id', table_name='activities')
+    op.drop_index('ix_activities_task_id_activity_seq', table_name='activities')
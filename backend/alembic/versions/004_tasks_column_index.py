@@ -0,0 +1,22 @@
+"""tasks per-column ordering index
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-17 09:30:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_tasks_status_ordering_index_id', 'tasks', ['status', 'ordering_index', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tasks_status_ordering_index_id', table_name='tasks')
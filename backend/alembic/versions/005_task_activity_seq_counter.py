@@ -0,0 +1,52 @@
+"""per-task activity sequence counter
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('tasks', sa.Column('last_activity_seq', sa.Integer(), nullable=False, server_default='0'))
+
+    # MAX()+1 allocation could hand out duplicates under concurrency; renumber
+    # each task's history densely before the counter takes over.
+    op.execute(
+        """
+        UPDATE activities a
+        SET activity_seq = r.rn
+        FROM (
+            SELECT id, row_number() OVER (
+                PARTITION BY task_id ORDER BY activity_seq, created_at, id
+            ) AS rn
+            FROM activities
+        ) r
+        WHERE a.id = r.id AND a.activity_seq <> r.rn
+        """
+    )
+    op.execute(
+        """
+        UPDATE tasks t
+        SET last_activity_seq = s.max_seq
+        FROM (SELECT task_id, max(activity_seq) AS max_seq FROM activities GROUP BY task_id) s
+        WHERE t.id = s.task_id
+        """
+    )
+
+    op.drop_index('ix_activities_task_id_activity_seq', table_name='activities')
+    op.create_index('uq_activities_task_id_activity_seq', 'activities', ['task_id', 'activity_seq'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('uq_activities_task_id_activity_seq', table_name='activities')
+    op.create_index('ix_activities_task_id_activity_seq', 'activities', ['task_id', 'activity_seq'], unique=False)
+    op.drop_column('tasks', 'last_activity_seq')
@@ -0,0 +1,44 @@
+"""task change xid and tombstones for delta sync
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+CURRENT_XID_SQL = "pg_current_xact_id()::text::bigint"
+
+
+def upgrade() -> None:
+    # Existing rows get this migration's xid, so the first sync after the
+    # upgrade is a full one.
+    op.add_column(
+        'tasks',
+        sa.Column('change_xid', sa.BigInteger(), nullable=False, server_default=sa.text(CURRENT_XID_SQL)),
+    )
+    op.create_index('ix_tasks_change_xid', 'tasks', ['change_xid'], unique=False)
+
+    op.create_table(
+        'task_tombstones',
+        sa.Column('task_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('change_xid', sa.BigInteger(), nullable=False, server_default=sa.text(CURRENT_XID_SQL)),
+        sa.PrimaryKeyConstraint('task_id'),
+    )
+    op.create_index('ix_task_tombstones_change_xid', 'task_tombstones', ['change_xid'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_task_tombstones_change_xid', table_name='task_tombstones')
+    op.drop_table('task_tombstones')
+    op.drop_index('ix_tasks_change_xid', table_name='tasks')
+    op.drop_column('tasks', 'change_xid')
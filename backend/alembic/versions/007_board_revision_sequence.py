@@ -0,0 +1,25 @@
+"""board revision sequence for conditional GETs
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-17 11:30:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE SEQUENCE board_revision_seq")
+    # Until the first nextval() last_value already reads 1, and the first bump
+    # would return that same 1; consume it so every bump changes the value.
+    op.execute("SELECT nextval('board_revision_seq')")
+
+
+def downgrade() -> None:
+    op.execute("DROP SEQUENCE board_revision_seq")
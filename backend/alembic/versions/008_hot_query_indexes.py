@@ -0,0 +1,42 @@
+"""indexes for comment threads, the work queue and the typed activity feed
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '008'
+down_revision = '007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY builds without blocking writes, but cannot run inside a
+    # transaction. if_not_exists makes a rerun skip the indexes already built;
+    # an interrupted build leaves an INVALID index that must be dropped first.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_comments_task_id_created_at', 'comments', ['task_id', 'created_at'],
+            unique=False, postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            'ix_tasks_actionable_priority', 'tasks', ['priority', 'ordering_index', 'id'],
+            unique=False, postgresql_where=sa.text("status IN ('Ready', 'In Progress')"),
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            'ix_activities_type_created_at_id', 'activities', ['type', 'created_at', 'id'],
+            unique=False, postgresql_concurrently=True, if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_activities_type_created_at_id', table_name='activities', postgresql_concurrently=True)
+        op.drop_index('ix_tasks_actionable_priority', table_name='tasks', postgresql_concurrently=True)
+        op.drop_index('ix_comments_task_id_created_at', table_name='comments', postgresql_concurrently=True)
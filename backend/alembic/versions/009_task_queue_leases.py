@@ -0,0 +1,30 @@
+"""lease columns for claiming tasks off the work queue
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '009'
+down_revision = '008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Nullable without a default: a catalog-only change, no table rewrite.
+    # Claims scan ix_tasks_actionable_priority, so no new index is needed.
+    op.add_column('tasks', sa.Column('lease_owner', sa.String(length=120), nullable=True))
+    op.add_column('tasks', sa.Column('lease_token', postgresql.UUID(as_uuid=True), nullable=True))
+    op.add_column('tasks', sa.Column('lease_expires_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('tasks', 'lease_expires_at')
+    op.drop_column('tasks', 'lease_token')
+    op.drop_column('tasks', 'lease_owner')
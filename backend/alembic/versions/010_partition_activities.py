@@ -0,0 +1,109 @@
+"""monthly range partitions for activities
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from datetime import date, datetime, timezone
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '010'
+down_revision = '009'
+branch_labels = None
+depends_on = None
+
+# Months created past the current one; the app keeps extending this
+MONTHS_AHEAD = 2
+
+
+def _next_month(month: date) -> date:
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def _create_table(name: str, **kw) -> None:
+    op.create_table(
+        name,
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('task_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('type', sa.String(length=50), nullable=False),
+        sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('actor', sa.String(length=120), nullable=False),
+        sa.Column('activity_seq', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        **kw,
+    )
+
+
+def upgrade() -> None:
+    # Rewrites the table: the copy holds an exclusive lock on the old one
+    # for as long as it takes, so schedule it with the app stopped.
+    op.execute('ALTER TABLE activities RENAME TO activities_unpartitioned')
+    op.execute('ALTER TABLE activities_unpartitioned RENAME CONSTRAINT activities_pkey TO activities_unpartitioned_pkey')
+    op.execute('ALTER INDEX ix_activities_created_at_id RENAME TO ix_activities_unpartitioned_created_at_id')
+    op.execute('ALTER INDEX ix_activities_type_created_at_id RENAME TO ix_activities_unpartitioned_type_created_at_id')
+
+    # The partition key has to be part of every unique constraint, so the
+    # primary key becomes (id, created_at) and (task_id, activity_seq) is
+    # no longer unique; tasks.last_activity_seq still hands out each
+    # sequence number once.
+    _create_table('activities', postgresql_partition_by='RANGE (created_at)')
+
+    first = op.get_bind().execute(sa.text('SELECT min(created_at) FROM activities_unpartitioned')).scalar()
+    today = datetime.now(timezone.utc).date()
+    month = (first.astimezone(timezone.utc).date() if first is not None else today).replace(day=1)
+    last = today.replace(day=1)
+    for _ in range(MONTHS_AHEAD):
+        last = _next_month(last)
+    while month <= last:
+        upper = _next_month(month)
+        op.execute(
+            f"CREATE TABLE activities_{month:%Y_%m} PARTITION OF activities "
+            f"FOR VALUES FROM ('{month}T00:00:00+00:00') TO ('{upper}T00:00:00+00:00')"
+        )
+        month = upper
+    # Catches rows no monthly partition covers yet, so inserts never fail
+    op.execute('CREATE TABLE activities_default PARTITION OF activities DEFAULT')
+
+    op.execute(
+        'INSERT INTO activities (id, task_id, type, payload, actor, activity_seq, created_at) '
+        'SELECT id, task_id, type, payload, actor, activity_seq, created_at FROM activities_unpartitioned'
+    )
+    op.drop_table('activities_unpartitioned')
+
+    # Indexes and constraints after the bulk copy; each cascades to every partition
+    op.create_primary_key('activities_pkey', 'activities', ['id', 'created_at'])
+    op.create_foreign_key(
+        'activities_task_id_fkey', 'activities', 'tasks', ['task_id'], ['id'], ondelete='CASCADE'
+    )
+    op.create_index('ix_activities_task_id_activity_seq', 'activities', ['task_id', 'activity_seq'], unique=False)
+    op.create_index('ix_activities_created_at_id', 'activities', ['created_at', 'id'], unique=False)
+    op.create_index('ix_activities_type_created_at_id', 'activities', ['type', 'created_at', 'id'], unique=False)
+    op.execute('ANALYZE activities')
+
+
+def downgrade() -> None:
+    # Partitions already archived by the retention job are not restored
+    op.execute('ALTER TABLE activities RENAME TO activities_partitioned')
+    op.execute('ALTER TABLE activities_partitioned RENAME CONSTRAINT activities_pkey TO activities_partitioned_pkey')
+    op.execute('ALTER INDEX ix_activities_created_at_id RENAME TO ix_activities_partitioned_created_at_id')
+    op.execute('ALTER INDEX ix_activities_type_created_at_id RENAME TO ix_activities_partitioned_type_created_at_id')
+
+    _create_table('activities')
+    op.execute(
+        'INSERT INTO activities (id, task_id, type, payload, actor, activity_seq, created_at) '
+        'SELECT id, task_id, type, payload, actor, activity_seq, created_at FROM activities_partitioned'
+    )
+    op.drop_table('activities_partitioned')  # drops every partition with it
+
+    op.create_primary_key('activities_pkey', 'activities', ['id'])
+    op.create_foreign_key(
+        'activities_task_id_fkey', 'activities', 'tasks', ['task_id'], ['id'], ondelete='CASCADE'
+    )
+    op.create_index('uq_activities_task_id_activity_seq', 'activities', ['task_id', 'activity_seq'], unique=True)
+    op.create_index('ix_activities_created_at_id', 'activities', ['created_at', 'id'], unique=False)
+    op.create_index('ix_activities_type_created_at_id', 'activities', ['type', 'created_at', 'id'], unique=False)
@@ -1,9 +1,13 @@
 from fastapi import APIRouter
 
-from app.api.routes import tasks, activities, comments, auth
+from app.api.routes import tasks, activities, comments, auth, events, export, imports, queue
 
 api_router = APIRouter()
 api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
 api_router.include_router(tasks.router, prefix="/tasks", tags=["tasks"])
 api_router.include_router(activities.router, prefix="/activities", tags=["activities"])
 api_router.include_router(comments.router, prefix="/comments", tags=["comments"])
+api_router.include_router(events.router, prefix="/events", tags=["events"])
+api_router.include_router(export.router, prefix="/export", tags=["export"])
+api_router.include_router(imports.router, prefix="/import", tags=["import"])
+api_router.include_router(queue.router, prefix="/queue", tags=["queue"])
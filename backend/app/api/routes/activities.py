@@ -1,55 +1,79 @@
 from __future__ import annotations
 
 import uuid
+from datetime import datetime
 
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.db import get_db
-from app.models.activity import Activity
-from app.models.task import Task
+from app.core.db import get_db, release
+from app.core.deps import board_etag
+from app.core.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
+from app.core.query_count import query_budget
+from app.core.responses import rows_response
 from app.schemas.activity import ActivityRead
+from app.services import activity_service
 
 router = APIRouter()
 
 
-@router.get("/", response_model=list[ActivityRead])
+@router.get("/", response_model=list[ActivityRead], dependencies=[Depends(board_etag)])
+@query_budget(2)
 async def list_all_activities(
+    response: Response,
     db: AsyncSession = Depends(get_db),
     limit: int = Query(100, ge=1, le=500),
     offset: int = Query(0, ge=0),
+    cursor: str | None = Query(None, description="Opaque cursor from the X-Next-Cursor header; overrides offset"),
     type: str | None = Query(None, description="Filter by activity type"),
     exclude_type: str | None = Query(None, description="Exclude specific activity type"),
 ):
     """List all activities across all tasks, newest first."""
-    stmt = select(Activity).order_by(Activity.created_at.desc())
-    if type:
-        stmt = stmt.where(Activity.type == type)
-    if exclude_type:
-        stmt = stmt.where(Activity.type != exclude_type)
-    stmt = stmt.limit(limit).offset(offset)
-    result = await db.execute(stmt)
-    return result.scalars().all()
+    after = None
+    if cursor:
+        created_at, activity_id = decode_cursor(cursor, 2)
+        try:
+            after = (datetime.fromisoformat(created_at), uuid.UUID(activity_id))
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+    activities = await activity_service.list_activities(
+        db, limit=limit, offset=offset, after=after, type=type, exclude_type=exclude_type
+    )
+    await release(db)
+    if len(activities) == limit:
+        last = activities[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(last.created_at.isoformat(), last.id)
+    return rows_response(activities, ActivityRead, response)
 
 
-@router.get("/task/{task_id}", response_model=list[ActivityRead])
+@router.get("/task/{task_id}", response_model=list[ActivityRead], dependencies=[Depends(board_etag)])
+@query_budget(2)
 async def list_task_activities(
     task_id: uuid.UUID,
+    response: Response,
     db: AsyncSession = Depends(get_db),
     limit: int = Query(50, ge=1, le=500),
     offset: int = Query(0, ge=0),
+    cursor: str | None = Query(None, description="Opaque cursor from the X-Next-Cursor header; overrides offset"),
     exclude_type: str | None = Query(None, description="Exclude specific activity type"),
 ):
-    stmt = select(Activity).where(Activity.task_id == task_id)
-    
-    if exclude_type:
-        stmt = stmt.where(Activity.type != exclude_type)
-        
-    result = await db.execute(
-        stmt
-        .order_by(Activity.created_at.desc(), Activity.activity_seq.desc())
-        .limit(limit)
-        .offset(offset)
+    before = None
+    if cursor:
+        # created_at rides along so later pages can skip newer partitions
+        cursor_task_id, seq, created_at = decode_cursor(cursor, 3)
+        try:
+            if cursor_task_id != str(task_id):
+                raise ValueError(cursor_task_id)
+            before = (int(seq), datetime.fromisoformat(created_at))
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+    activities = await activity_service.list_task_activities(
+        db, task_id, limit=limit, offset=offset, before=before, exclude_type=exclude_type
     )
-    return result.scalars().all()
+    await release(db)
+    if len(activities) == limit:
+        last = activities[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(task_id, last.activity_seq, last.created_at.isoformat())
+    return rows_response(activities, ActivityRead, response)
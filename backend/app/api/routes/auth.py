@@ -2,12 +2,15 @@ from __future__ import annotations
 
 from datetime import timedelta
 
-from fastapi import APIRouter, Depends, HTTPException, status, Response
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.db import get_db
+from app.core.auth_cache import principal_cache
+from app.core.db import get_db, release
 from app.core.security import create_access_token, ACCESS_TOKEN_EXPIRE_MINUTES
-from app.core.deps import get_current_user
+from app.core.deps import get_current_user, get_request_token
+from app.core.query_count import query_budget
+from app.core.responses import rows_response
 from app.models.user import User
 from app.schemas.user import UserCreate, UserLogin, UserRead, Token
 from app.services import user_service
@@ -16,6 +19,7 @@ router = APIRouter()
 
 
 @router.post("/signup", response_model=UserRead, status_code=status.HTTP_201_CREATED)
+@query_budget(4)
 async def signup(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
     # Check if user already exists
     existing_user = await user_service.get_user_by_email(db, user_data.email)
@@ -31,7 +35,9 @@ async def signup(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Username already taken",
         )
-    
+
+    # Nothing written yet: don't hold a connection while the password hashes
+    await release(db)
     user = await user_service.create_user(db, user_data)
     await db.commit()
     await db.refresh(user)
@@ -39,8 +45,12 @@ async def signup(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
 
 
 @router.post("/login", response_model=None)
+@query_budget(2)
 async def login(response: Response, credentials: UserLogin, db: AsyncSession = Depends(get_db)):
-    user = await user_service.authenticate_user(db, credentials.username, credentials.password)
+    user = await user_service.get_user_by_login(db, credentials.username)
+    # Login only reads; give the connection back before bcrypt's ~100ms
+    await release(db)
+    user = await user_service.authenticate_user(user, credentials.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -66,20 +76,27 @@ async def login(response: Response, credentials: UserLogin, db: AsyncSession = D
 
 
 @router.post("/logout")
-async def logout(response: Response):
+@query_budget(0)
+async def logout(request: Request, response: Response):
+    token = get_request_token(request)
+    if token:
+        principal_cache.invalidate_token(token)
     response.delete_cookie(key="access_token")
     return {"message": "Logout successful"}
 
 
 @router.get("/me", response_model=UserRead)
+@query_budget(1)
 async def get_current_user_info(current_user: User = Depends(get_current_user)):
     return current_user
 
 
 @router.get("/users", response_model=list[UserRead])
+@query_budget(2)
 async def get_users(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     users = await user_service.get_users(db)
-    return users
+    await release(db)
+    return rows_response(users, UserRead)
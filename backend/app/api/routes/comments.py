@@ -2,25 +2,32 @@ from __future__ import annotations
 
 import uuid
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Response, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.db import get_db
+from app.core.db import get_db, release
+from app.core.deps import board_etag
+from app.core.query_count import query_budget
+from app.core.responses import rows_response
 from app.models.comment import Comment
 from app.schemas.comment import CommentCreate, CommentRead
-from app.services import activity_service
+from app.services import activity_service, event_service
 
 router = APIRouter()
 
 
-@router.get("/task/{task_id}", response_model=list[CommentRead])
-async def list_comments(task_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
+@router.get("/task/{task_id}", response_model=list[CommentRead], dependencies=[Depends(board_etag)])
+@query_budget(2)
+async def list_comments(task_id: uuid.UUID, response: Response, db: AsyncSession = Depends(get_db)):
     result = await db.execute(select(Comment).where(Comment.task_id == task_id).order_by(Comment.created_at.desc()))
-    return result.scalars().all()
+    comments = result.scalars().all()
+    await release(db)
+    return rows_response(comments, CommentRead, response)
 
 
 @router.post("/task/{task_id}", response_model=CommentRead, status_code=status.HTTP_201_CREATED)
+@query_budget(5)
 async def create_comment(task_id: uuid.UUID, payload: CommentCreate, db: AsyncSession = Depends(get_db)):
     comment = Comment(task_id=task_id, **payload.model_dump())
     db.add(comment)
@@ -35,6 +42,7 @@ async def create_comment(task_id: uuid.UUID, payload: CommentCreate, db: AsyncSe
         payload={"body": payload.body},
     )
 
+    event_service.comment_created(db, comment)
     await db.commit()
     await db.refresh(comment)
     return comment
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.db import get_db
+from app.core.deps import get_current_user
+from app.models.user import User
+from app.services.event_service import board_events
+
+router = APIRouter()
+
+KEEPALIVE_SECONDS = 15.0
+
+
+@router.get("/stream")
+async def stream_board_events(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Server-Sent Events feed of board deltas.
+
+    Events: ``task.upserted``, ``task.deleted``, ``activity.created``,
+    ``activity.updated`` (an edit was merged into an existing row),
+    ``activity.deleted`` (merged edits cancelled out; drop the row),
+    ``comment.created``, ``column.rebalanced`` (reload that column),
+    ``board.imported`` (a bulk import landed; reload the board),
+    ``activities.archived`` (a month of history left the database; reload
+    activity feeds), and
+    ``resync`` when the client fell behind or the server lost its LISTEN
+    connection; after ``resync`` the stream ends and the client should
+    refetch before reconnecting.
+    """
+    # Authentication is done; don't keep a pooled connection for the stream's lifetime.
+    await db.close()
+    subscription = await board_events.subscribe()
+
+    async def event_source():
+        try:
+            yield "retry: 3000\n\n"
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscription.get(), timeout=KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    yield ": keepalive\n\n"
+                    continue
+                if event is None:
+                    break
+                yield f"event: {event['type']}\ndata: {json.dumps(event, separators=(',', ':'))}\n\n"
+        finally:
+            board_events.unsubscribe(subscription)
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
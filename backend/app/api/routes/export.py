@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+
+from app.core.deps import get_current_user
+from app.models.user import User
+from app.services import export_service
+
+router = APIRouter()
+
+
+@router.get("/{kind}")
+async def export_rows(
+    kind: Literal["tasks", "activities", "comments"],
+    format: Literal["ndjson", "csv"] = Query("ndjson"),
+    since: datetime | None = Query(
+        None, description="Only rows updated (tasks) or created (activities, comments) at or after this time"
+    ),
+    current_user: User = Depends(get_current_user),
+):
+    """Stream a whole table as NDJSON (one object per line) or CSV with a header row."""
+    return StreamingResponse(
+        export_service.stream_export(kind, format, since),
+        media_type=export_service.FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{kind}.{format}"'},
+    )
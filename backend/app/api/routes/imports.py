@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import io
+import tempfile
+from typing import AsyncIterator, Literal
+
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
+
+from app.core.deps import get_current_user
+from app.core.responses import json_bytes
+from app.models.user import User
+from app.services import import_service
+
+router = APIRouter()
+
+
+# Bodies up to this size stay in memory; larger ones spill to a temp file
+SPOOL_MAX_BYTES = 8 * 1024 * 1024
+
+
+async def _spool_body(request: Request) -> tempfile.SpooledTemporaryFile:
+    # The body has to be read before the response starts: once streaming,
+    # Starlette consumes receive() itself to watch for disconnects.
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+    async for chunk in request.stream():
+        spool.write(chunk)
+    spool.seek(0)
+    return spool
+
+
+async def _lines(spool: tempfile.SpooledTemporaryFile) -> AsyncIterator[str]:
+    with io.TextIOWrapper(spool, encoding="utf-8", newline="") as text:
+        for line in text:
+            yield line
+
+
+@router.post("/tasks")
+async def import_tasks(
+    request: Request,
+    format: Literal["ndjson", "csv"] = Query("ndjson"),
+    current_user: User = Depends(get_current_user),
+):
+    """Bulk-load tasks from an NDJSON or CSV request body.
+
+    NDJSON records follow ``TaskImport`` (optionally with a ``comments``
+    list); CSV files carry the same fields as columns, with ``tags`` and
+    ``comments`` as JSON cells. The response is an NDJSON stream of
+    progress reports, one per loaded batch, ending with ``"done": true``.
+    """
+    spool = await _spool_body(request)
+    reports = import_service.import_tasks(_lines(spool), format, actor=current_user.username)
+
+    async def progress():
+        async for report in reports:
+            yield json_bytes(report) + b"\n"
+
+    return StreamingResponse(progress(), media_type="application/x-ndjson")
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import uuid
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.db import get_db, release
+from app.core.deps import get_current_user
+from app.core.query_count import query_budget
+from app.core.responses import rows_response
+from app.models.user import User
+from app.schemas.queue import (
+    ClaimRequest, ClaimResponse, CompleteRequest, HeartbeatRequest, LeaseRead, ReleaseRequest,
+)
+from app.schemas.task import TaskRead, TaskSummary
+from app.services import event_service, queue_service, task_service
+
+router = APIRouter()
+
+
+def _lease(row) -> dict:
+    return {
+        "task_id": row.id,
+        "lease_owner": row.lease_owner,
+        "lease_token": row.lease_token,
+        "lease_expires_at": row.lease_expires_at,
+    }
+
+
+@router.get("/next", response_model=list[TaskSummary])
+@query_budget(5)
+async def next_best_tasks(
+    response: Response,
+    limit: int = Query(20, ge=1, le=200),
+    owner: str | None = Query(None, description="Only tasks owned by this user"),
+    db: AsyncSession = Depends(get_db),
+):
+    tasks = await queue_service.next_best_tasks(db, limit=limit, owner=owner)
+    await release(db)
+    return rows_response(tasks, TaskSummary, response)
+
+
+@router.post("/claim", response_model=ClaimResponse, responses={204: {"description": "Nothing to claim"}})
+@query_budget(2)
+async def claim_task(
+    body: ClaimRequest | None = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    lease_seconds = body.lease_seconds if body is not None else None
+    row = await queue_service.claim_next_task(db, owner=current_user.username, lease_seconds=lease_seconds)
+    await db.commit()
+    if row is None:
+        return Response(status_code=status.HTTP_204_NO_CONTENT)
+    return {**_lease(row), "task": row}
+
+
+@router.post("/{task_id}/heartbeat", response_model=LeaseRead)
+@query_budget(3)
+async def heartbeat(
+    task_id: uuid.UUID,
+    body: HeartbeatRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    try:
+        lease = await queue_service.renew_lease(db, task_id, body.lease_token, body.lease_seconds)
+    except task_service.TaskNotFoundError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
+    except queue_service.LeaseLostError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    await db.commit()
+    return lease
+
+
+@router.post("/{task_id}/complete", response_model=TaskRead)
+@query_budget(6)
+async def complete_task(
+    task_id: uuid.UUID,
+    body: CompleteRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    try:
+        task = await queue_service.complete_task(
+            db, task_id, body.lease_token, status=body.status, actor=current_user.username
+        )
+    except task_service.TaskNotFoundError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
+    except queue_service.LeaseLostError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
+    event_service.task_upserted(db, task)
+    await db.commit()
+    return task
+
+
+@router.post("/{task_id}/release", status_code=status.HTTP_204_NO_CONTENT)
+@query_budget(3)
+async def release_task(
+    task_id: uuid.UUID,
+    body: ReleaseRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    try:
+        await queue_service.release_lease(db, task_id, body.lease_token)
+    except task_service.TaskNotFoundError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
+    except queue_service.LeaseLostError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    await db.commit()
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -2,30 +2,94 @@ from __future__ import annotations
 
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.db import get_db
-from app.core.deps import get_current_user
+from app.core.db import get_db, release
+from app.core.deps import board_etag, get_current_user
+from app.core.query_count import query_budget
+from app.core.responses import json_response, row_dicts, rows_response
 from app.models.task import Task
 from app.models.user import User
-from app.schemas.task import TaskCreate, TaskRead, TaskUpdate, ReorderRequest, BulkUpdateRequest, BulkUpdateResponse
-from app.services import activity_service, task_service
+from app.schemas.task import (
+    TaskCreate, TaskRead, TaskUpdate, ReorderRequest, BulkUpdateRequest, BulkUpdateResponse,
+    BoardWindow, MoveRequest, Status, TaskChanges, TaskSummary,
+)
+from app.services import activity_service, event_service, task_service
 
 router = APIRouter()
 
 
-@router.get("/", response_model=list[TaskRead])
+@router.get("/", response_model=list[TaskRead], dependencies=[Depends(board_etag)])
+@query_budget(2)
 async def list_tasks(
+    response: Response,
     sort: str = "manual",
     db: AsyncSession = Depends(get_db)
 ):
     tasks = await task_service.list_tasks(db, sort=sort)
-    return tasks
+    await release(db)
+    return rows_response(tasks, TaskRead, response)
+
+
+@router.get("/board", response_model=BoardWindow, dependencies=[Depends(board_etag)])
+@query_budget(4)
+async def get_board_window(
+    response: Response,
+    limit: int = Query(50, ge=1, le=500, description="Cards per column"),
+    exact_totals: bool = Query(False, description="Count every column's cards instead of estimating full columns"),
+    db: AsyncSession = Depends(get_db),
+):
+    columns, totals, estimated = await task_service.list_board_window(db, per_column=limit, exact_totals=exact_totals)
+    await release(db)
+    return json_response(
+        {
+            "columns": [
+                {
+                    "status": column,
+                    "total": totals.get(column, 0),
+                    "total_estimated": column in estimated,
+                    "tasks": row_dicts(tasks, TaskSummary),
+                }
+                for column, tasks in columns.items()
+            ]
+        },
+        response,
+    )
+
+
+@router.get("/changes", response_model=TaskChanges)
+@query_budget(3)
+async def list_task_changes(
+    since: int | None = Query(None, ge=0, description="watermark returned by the previous call"),
+    db: AsyncSession = Depends(get_db),
+):
+    """Tasks created/updated and ids deleted since the client's last sync."""
+    watermark, tasks, deleted = await task_service.list_changes(db, since)
+    await release(db)
+    return json_response({"watermark": watermark, "tasks": row_dicts(tasks, TaskRead), "deleted": deleted})
+
+
+@router.get("/columns/{column}", response_model=list[TaskSummary], dependencies=[Depends(board_etag)])
+@query_budget(2)
+async def list_column_tasks(
+    column: Status,
+    response: Response,
+    limit: int = Query(50, ge=1, le=500),
+    after_index: float | None = Query(None, description="ordering_index of the last card already loaded"),
+    after_id: uuid.UUID | None = Query(None, description="id of the last card already loaded (tie-breaker)"),
+    db: AsyncSession = Depends(get_db),
+):
+    tasks = await task_service.list_column_tasks(
+        db, column, limit=limit, after_index=after_index, after_id=after_id
+    )
+    await release(db)
+    return rows_response(tasks, TaskSummary, response)
 
 
 @router.post("/", response_model=TaskRead, status_code=status.HTTP_201_CREATED)
+@query_budget(7)
 async def create_task(
     payload: TaskCreate,
     db: AsyncSession = Depends(get_db),
@@ -39,82 +103,42 @@ async def create_task(
         type="created",
         payload={"title": task.title},
     )
+    event_service.task_upserted(db, task)
     await db.commit()
     await db.refresh(task)
     return task
 
 
 @router.patch("/{task_id}", response_model=TaskRead)
+@query_budget(5)
 async def update_task(
     task_id: uuid.UUID,
     payload: TaskUpdate,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    # Grab old state for activity diff
-    old_task = await db.execute(
-        select(Task).where(Task.id == task_id)
-    )
-    old_task_obj = old_task.scalar_one()
-    old_status = old_task_obj.status
-    old_priority = old_task_obj.priority
-    old_owner = old_task_obj.owner
-
     try:
-        task = await task_service.update_task(db, task_id, payload)
+        task = await task_service.update_task(db, task_id, payload, actor=current_user.username)
+    except task_service.TaskNotFoundError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
     except task_service.VersionConflictError:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="stale version")
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
-    # Build rich payload with old → new values
-    changes = payload.model_dump(exclude_none=True, exclude={"if_match"})
-    activity_payload: dict = {}
-
-    if "status" in changes and changes["status"] != old_status:
-        activity_payload["old_status"] = old_status
-        activity_payload["new_status"] = changes["status"]
-    if "priority" in changes and changes["priority"] != old_priority:
-        activity_payload["old_priority"] = old_priority
-        activity_payload["new_priority"] = changes["priority"]
-    if "owner" in changes:
-        activity_payload["old_owner"] = old_owner
-        activity_payload["new_owner"] = changes["owner"]
-    if "title" in changes:
-        activity_payload["title"] = changes["title"]
-    if "description" in changes:
-        activity_payload["description"] = True
-    if "estimate" in changes:
-        activity_payload["estimate"] = changes["estimate"]
-
-    if activity_payload:
-        await activity_service.log_activity(
-            db,
-            task_id=task.id,
-            actor=current_user.username,
-            type="updated",
-            payload=activity_payload,
-        )
-
+    event_service.task_upserted(db, task)
     await db.commit()
-    await db.refresh(task)
     return task
 
 
 @router.post("/{task_id}/reorder", response_model=TaskRead)
+@query_budget(5)
 async def reorder_task(
     task_id: uuid.UUID,
     body: ReorderRequest,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    # Capture old status before reorder
-    old_result = await db.execute(
-        select(Task).where(Task.id == task_id)
-    )
-    old_task = old_result.scalar_one()
-    old_status = old_task.status
-
     try:
         task = await task_service.reorder_task(
             db,
@@ -122,26 +146,59 @@ async def reorder_task(
             new_status=body.new_status,
             new_ordering_index=body.new_ordering_index,
             if_match=body.if_match,
+            actor=current_user.username,
+        )
+    except task_service.TaskNotFoundError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
+    except task_service.VersionConflictError:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="stale version")
+
+    event_service.task_upserted(db, task)
+    await db.commit()
+    return task
+
+
+@router.post("/{task_id}/move", response_model=TaskRead)
+@query_budget(8)
+async def move_task(
+    task_id: uuid.UUID,
+    body: MoveRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Move a task next to the given neighbours; the server computes the ordering_index."""
+    try:
+        task, old_status = await task_service.move_task(
+            db,
+            task_id,
+            new_status=body.new_status,
+            after_id=body.after_id,
+            before_id=body.before_id,
+            if_match=body.if_match,
         )
+    except task_service.TaskNotFoundError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
     except task_service.VersionConflictError:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="stale version")
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
-    # Only log a move activity if status actually changed
-    if body.new_status is not None and body.new_status != old_status:
+    if task.status != old_status:
         await activity_service.log_activity(
             db,
             task_id=task.id,
             actor=current_user.username,
             type="moved",
-            payload={"old_status": old_status, "new_status": body.new_status},
+            payload={"old_status": old_status, "new_status": task.status},
         )
 
+    event_service.task_upserted(db, task)
     await db.commit()
-    await db.refresh(task)
     return task
 
 
 @router.post("/bulk", response_model=BulkUpdateResponse)
+@query_budget(6)
 async def bulk_update_tasks(
     body: BulkUpdateRequest,
     db: AsyncSession = Depends(get_db),
@@ -150,89 +207,20 @@ async def bulk_update_tasks(
     if not body.task_ids:
         return {"updated": [], "failed": []}
 
-    # Fetch all requested tasks
-    result = await db.execute(select(Task).where(Task.id.in_(body.task_ids)))
-    tasks = list(result.scalars().all())
-
-    if not tasks:
-        # If no tasks found, all requested IDs are technically "failed" (not found)
-        # But for simplicity, we can just return empty lists or error if strict.
-        # Let's return empty to be safe, or raise 404 if partial success isn't possible.
-        # Given "granular feedback", returning empty lists is safer than 404ing the whole batch.
-        return {"updated": [], "failed": [{"task_id": tid, "error": "Not found"} for tid in body.task_ids]}
-
-    updated_tasks = []
-    failed_items = []
-
-    # Map for easy lookup
-    tasks_map = {t.id: t for t in tasks}
-
-    # Iterate through requested IDs to handle missing ones too
-    for task_id in body.task_ids:
-        task = tasks_map.get(task_id)
-        if not task:
-            failed_items.append({"task_id": task_id, "error": "Not found"})
-            continue
-
-        # Check version if provided
-        expected_version = body.versions.get(task_id)
-        if expected_version is not None and task.version != expected_version:
-            failed_items.append({"task_id": task_id, "error": "Conflict: Task has been modified by someone else"})
-            continue
-
+    updated_tasks, failed_items = await task_service.bulk_update_tasks(
+        db, body, actor=current_user.username
+    )
+    for task in updated_tasks:
         if body.delete:
-            await activity_service.log_activity(
-                db,
-                task_id=task.id,
-                actor=current_user.username,
-                type="deleted",
-                payload={"title": task.title},
-            )
-            await db.delete(task)
-            # For delete, we don't add to updated_tasks list usually, or we return the deleted object
-            # But the response model expects TaskRead. 
-            # If deleted, we can't return it easily as "updated".
-            # Let's assume bulk delete returns the deleted objects (before deletion state).
-            updated_tasks.append(task)
-            continue
-
-        # Apply updates
-        changes: dict = {}
-        if body.status is not None and body.status != task.status:
-            changes["old_status"] = task.status
-            changes["new_status"] = body.status
-            task.status = body.status
-        if body.priority is not None and body.priority != task.priority:
-            changes["old_priority"] = task.priority
-            changes["new_priority"] = body.priority
-            task.priority = body.priority
-        if body.owner is not None:
-            changes["old_owner"] = task.owner
-            changes["new_owner"] = body.owner
-            task.owner = body.owner
-
-        if changes:
-            task.bump_version()
-            await activity_service.log_activity(
-                db,
-                task_id=task.id,
-                actor=current_user.username,
-                type="bulk_updated",
-                payload=changes,
-            )
-        updated_tasks.append(task)
-
+            event_service.task_deleted(db, task.id)
+        else:
+            event_service.task_upserted(db, task)
     await db.commit()
-    
-    # Refresh updated tasks (skip deleted ones)
-    if not body.delete:
-        for task in updated_tasks:
-            await db.refresh(task)
-
     return {"updated": updated_tasks, "failed": failed_items}
 
 
 @router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
+@query_budget(10)
 async def delete_task(
     task_id: uuid.UUID,
     db: AsyncSession = Depends(get_db),
@@ -251,5 +239,7 @@ async def delete_task(
         payload={"title": task.title},
     )
     await db.delete(task)
+    await task_service.record_tombstones(db, [task.id])
+    event_service.task_deleted(db, task.id)
     await db.commit()
 
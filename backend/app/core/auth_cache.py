@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import time
+import uuid
+from collections import OrderedDict
+from typing import Optional
+
+from app.core.config import get_settings
+from app.models.user import User
+
+
+class PrincipalCache:
+    """Per-worker LRU of verified access tokens to user principals.
+
+    Entries live for ``ttl_seconds`` (never past the token's own expiry), so a
+    change made by another worker is picked up within one TTL at the latest.
+    Changes made in this worker should call ``invalidate_user``.
+
+    Only touched from the event loop thread, so no locking is needed.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, User]] = OrderedDict()
+        self._tokens_by_user: dict[uuid.UUID, set[str]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, token: str) -> Optional[User]:
+        entry = self._entries.get(token)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, user = entry
+        if expires_at <= time.monotonic():
+            self._discard(token)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(token)
+        self.hits += 1
+        return user
+
+    def put(self, token: str, user: User, token_exp: Optional[float] = None) -> None:
+        ttl = self.ttl_seconds
+        if token_exp is not None:
+            ttl = min(ttl, token_exp - time.time())
+        if ttl <= 0 or self.max_entries <= 0:
+            return
+        self._discard(token)
+        self._entries[token] = (time.monotonic() + ttl, _snapshot(user))
+        self._tokens_by_user.setdefault(user.id, set()).add(token)
+        while len(self._entries) > self.max_entries:
+            oldest = next(iter(self._entries))
+            self._discard(oldest)
+            self.evictions += 1
+
+    def invalidate_token(self, token: str) -> None:
+        self._discard(token)
+
+    def invalidate_user(self, user_id: uuid.UUID) -> None:
+        for token in self._tokens_by_user.pop(user_id, set()):
+            self._entries.pop(token, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._tokens_by_user.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+    def _discard(self, token: str) -> None:
+        entry = self._entries.pop(token, None)
+        if entry is None:
+            return
+        tokens = self._tokens_by_user.get(entry[1].id)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._tokens_by_user[entry[1].id]
+
+
+def _snapshot(user: User) -> User:
+    # A detached copy: the cached principal must not be tied to the session
+    # of the request that loaded it.
+    return User(**{column.key: getattr(user, column.key) for column in User.__table__.columns})
+
+
+settings = get_settings()
+principal_cache = PrincipalCache(
+    max_entries=settings.auth_cache_max_entries,
+    ttl_seconds=settings.auth_cache_ttl_seconds,
+)
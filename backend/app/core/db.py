@@ -1,16 +1,105 @@
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Awaitable, Callable
 
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
+from app.core import metrics, query_count
 from app.core.config import get_settings
+from app.core.pool import InstrumentedPool
+
+CommitHook = Callable[[AsyncSession], Awaitable[None]]
+
+_TRANSACTION_STATE = "transaction_state"
+
+
+class AppSession(AsyncSession):
+    """AsyncSession that runs hooks registered for the current transaction.
+
+    Hooks added with ``before_commit`` run inside the transaction right before
+    COMMIT; hooks added with ``after_commit`` run once it has succeeded, in a
+    new transaction. Each runs once. They live in ``transaction_state``,
+    which is dropped by commit, rollback and close alike.
+    """
+
+    async def commit(self) -> None:
+        state = self.info.get(_TRANSACTION_STATE, {})
+        for hook in state.get("before_commit", ()):
+            await hook(self)
+        self.info.pop(_TRANSACTION_STATE, None)
+        await super().commit()
+        for hook in state.get("after_commit", ()):
+            await hook(self)
+
+    async def rollback(self) -> None:
+        self.info.pop(_TRANSACTION_STATE, None)
+        await super().rollback()
+
+    async def close(self) -> None:
+        self.info.pop(_TRANSACTION_STATE, None)
+        await super().close()
+
+
+def transaction_state(session: AsyncSession) -> dict:
+    """Scratch space that lives exactly as long as the session's current transaction."""
+    return session.info.setdefault(_TRANSACTION_STATE, {})
+
+
+def before_commit(session: AsyncSession, hook: CommitHook) -> None:
+    # dict keeps registration order and makes repeated registration a no-op
+    transaction_state(session).setdefault("before_commit", {})[hook] = None
+
+
+def after_commit(session: AsyncSession, hook: CommitHook) -> None:
+    transaction_state(session).setdefault("after_commit", {})[hook] = None
+
 
 settings = get_settings()
-engine = create_async_engine(settings.database_url, future=True, echo=False)
+engine = create_async_engine(
+    settings.database_url,
+    future=True,
+    echo=False,
+    poolclass=InstrumentedPool,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_timeout=settings.db_pool_timeout,
+    pool_recycle=settings.db_pool_recycle,
+    pool_pre_ping=settings.db_pool_pre_ping,
+)
+metrics.instrument_engine(engine)
+query_count.instrument_engine(engine)
+metrics.registry.gauge("db_pool_checked_out", "Connections currently lent out", lambda: engine.pool.checkedout())
+metrics.registry.gauge("db_pool_idle", "Open connections waiting in the pool", lambda: engine.pool.checkedin())
+metrics.registry.gauge(
+    "db_pool_overflow", "Connections open beyond db_pool_size", lambda: max(engine.pool.overflow(), 0)
+)
 AsyncSessionLocal = async_sessionmaker(
-    engine, expire_on_commit=False, autoflush=False, autocommit=False
+    engine, class_=AppSession, expire_on_commit=False, autoflush=False, autocommit=False
 )
 
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
+    """Request-scoped session.
+
+    Opening the session is free: it checks a connection out of the pool only
+    when it runs its first statement, so requests answered from caches (or
+    with a 304) never touch the pool. See ``release`` for handing the
+    connection back before the request is over.
+    """
     async with AsyncSessionLocal() as session:
         yield session
+
+
+async def release(session: AsyncSession) -> None:
+    """Return the session's connection to the pool now rather than at request end.
+
+    Call it once a route has everything it needs from the database and is
+    about to do slow non-database work: serializing a large response,
+    hashing a password. Objects already loaded stay readable (they are
+    detached, not expired); anything uncommitted is rolled back, so only
+    call it on read-only paths or after ``commit``. Running another
+    statement on the session simply checks out a new connection.
+    """
+    await session.close()
+
+
+def pool_stats() -> dict:
+    return engine.pool.snapshot()
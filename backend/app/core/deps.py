@@ -3,21 +3,17 @@ from __future__ import annotations
 import uuid
 from typing import Optional
 
-from fastapi import Depends, HTTPException, status, Request
+from fastapi import Depends, HTTPException, status, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.auth_cache import principal_cache
 from app.core.db import get_db
 from app.core.security import decode_access_token
 from app.models.user import User
-from app.services import user_service
+from app.services import revision_service, user_service
 
 
-
-
-async def get_current_user(
-    request: Request,
-    db: AsyncSession = Depends(get_db),
-) -> User:
+def get_request_token(request: Request) -> Optional[str]:
     # Try to get token from cookie first
     token = request.cookies.get("access_token")
     
@@ -26,16 +22,28 @@ async def get_current_user(
         auth_header = request.headers.get("Authorization")
         if auth_header and auth_header.startswith("Bearer "):
             token = auth_header
-    
+
+    # Remove "Bearer " prefix if present
+    if token and token.startswith("Bearer "):
+        token = token.split(" ")[1]
+    return token or None
+
+
+async def get_current_user(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+) -> User:
+    token = get_request_token(request)
     if not token:
          raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Not authenticated",
         )
 
-    # Remove "Bearer " prefix if present
-    if token.startswith("Bearer "):
-        token = token.split(" ")[1]
+    # Hot path: a token we already verified maps straight to its user
+    cached_user = principal_cache.get(token)
+    if cached_user is not None:
+        return cached_user
 
     payload = decode_access_token(token)
     if payload is None:
@@ -71,5 +79,34 @@ async def get_current_user(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Inactive user",
         )
-    
+
+    principal_cache.put(token, user, token_exp=payload.get("exp"))
     return user
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    # If-None-Match uses weak comparison, so W/"x" matches "x"
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+async def board_etag(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+) -> str:
+    """Conditional GET for board reads, keyed on the board revision counter.
+
+    Answers 304 before the route runs any query when the client's copy is
+    current; otherwise tags the response so the browser can revalidate.
+    """
+    etag = f'"{await revision_service.current_revision(db)}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return etag
@@ -0,0 +1,223 @@
+"""In-process metrics in the Prometheus text exposition format.
+
+Everything is recorded from the event loop thread (SQLAlchemy's async
+engine runs cursor events in greenlets on that same thread), so the
+collectors are plain dicts of numbers: no locks, and recording a sample is a
+dict lookup plus an addition or two. Each worker process exposes its own
+numbers on ``/metrics``; Prometheus sums them across workers.
+"""
+from __future__ import annotations
+
+import time
+from bisect import bisect_left
+from typing import Callable
+
+from sqlalchemy import event
+
+HTTP_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SQL_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+# Statement label values; anything else is reported as OTHER
+_SQL_VERBS = frozenset({"SELECT", "INSERT", "UPDATE", "DELETE", "WITH", "COPY", "NOTIFY", "LISTEN"})
+
+Labels = tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _label_text(names: tuple[str, ...], values: Labels, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(value)
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()) -> None:
+        self.name, self.help, self.labels = name, help, labels
+        self.values: dict[Labels, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def samples(self):
+        for labels, value in self.values.items():
+            yield self.name, _label_text(self.labels, labels), value
+
+
+class Gauge:
+    """A value read when scraped: a callback's result, or what ``inc`` accumulated."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, read: Callable[[], float] | None = None) -> None:
+        self.name, self.help, self.read = name, help, read
+        self.value = 0.0
+
+    def inc(self, amount: float = 1) -> None:
+        self.value += amount
+
+    def samples(self):
+        yield self.name, "", self.read() if self.read is not None else self.value
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(
+        self, name: str, help: str, labels: tuple[str, ...] = (), buckets: tuple[float, ...] = HTTP_BUCKETS
+    ) -> None:
+        self.name, self.help, self.labels, self.buckets = name, help, labels, buckets
+        # labels -> [count per bucket (last one is +Inf)..., sum]
+        self.series: dict[Labels, list[float]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        series = self.series.get(labels)
+        if series is None:
+            series = self.series[labels] = [0] * (len(self.buckets) + 2)
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def snapshot(self, *labels: str) -> dict:
+        """Cumulative buckets, count and sum of one series, as plain JSON."""
+        series = self.series.get(labels) or [0] * (len(self.buckets) + 2)
+        buckets, running = {}, 0
+        for bound, count in zip((*self.buckets, "+Inf"), series):
+            running += count
+            buckets[str(bound)] = running
+        return {"buckets": buckets, "count": running, "sum": series[-1]}
+
+    def samples(self):
+        for labels in self.series:
+            snapshot = self.snapshot(*labels)
+            for bound, count in snapshot["buckets"].items():
+                yield f"{self.name}_bucket", _label_text(self.labels, labels, f'le="{bound}"'), count
+            yield f"{self.name}_count", _label_text(self.labels, labels), snapshot["count"]
+            yield f"{self.name}_sum", _label_text(self.labels, labels), snapshot["sum"]
+
+
+class Registry:
+    def __init__(self) -> None:
+        self.metrics: dict[str, Counter | Gauge | Histogram] = {}
+
+    def add(self, metric):
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labels: tuple[str, ...] = ()) -> Counter:
+        return self.add(Counter(name, help, labels))
+
+    def gauge(self, name: str, help: str, read: Callable[[], float] | None = None) -> Gauge:
+        return self.add(Gauge(name, help, read))
+
+    def histogram(self, name: str, help: str, labels: tuple[str, ...] = (), buckets=HTTP_BUCKETS) -> Histogram:
+        return self.add(Histogram(name, help, labels, buckets))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(f"{name}{labels} {_number(value)}" for name, labels, value in metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+http_requests = registry.counter(
+    "http_requests_total", "HTTP requests handled, by route template and status", ("method", "route", "status")
+)
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds", "Time from request start until the response is fully sent", ("method", "route")
+)
+http_in_flight = registry.gauge("http_requests_in_flight", "Requests currently being handled")
+sql_statements = registry.counter("db_statements_total", "SQL statements executed, by verb", ("verb",))
+sql_duration = registry.histogram(
+    "db_statement_duration_seconds", "Round trip of one SQL statement", ("verb",), buckets=SQL_BUCKETS
+)
+sql_errors = registry.counter("db_statement_errors_total", "SQL statements that raised", ("verb",))
+version_conflicts = registry.counter(
+    "task_version_conflicts_total", "Writes rejected for a stale if_match version (HTTP 409)", ("operation",)
+)
+activities_logged = registry.counter("activities_logged_total", "Activity log rows written, by type", ("type",))
+activities_coalesced = registry.counter(
+    "activities_coalesced_total", "Activities merged into the actor's previous row instead of written, by type", ("type",)
+)
+next_best_lookups = registry.counter(
+    "next_best_lookups_total", "Next-best-task queries, by what answered them (index or sql)", ("source",)
+)
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording request counts, latency and in-flight requests.
+
+    Requests are labelled with the matched route template (``/api/tasks/{task_id}``),
+    never the raw path, so label cardinality stays bounded.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        http_in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            http_in_flight.inc(-1)
+            # The router stores the matched route in the (shared) scope
+            route = scope.get("route")
+            template = getattr(route, "path", None) or "unmatched"
+            http_request_duration.observe(time.perf_counter() - started, scope["method"], template)
+            http_requests.inc(scope["method"], template, str(status_code))
+
+
+def _verb(statement: str) -> str:
+    words = statement[:32].split(None, 1)
+    verb = words[0].upper() if words else ""
+    return verb if verb in _SQL_VERBS else "OTHER"
+
+
+def instrument_engine(engine) -> None:
+    """Count and time every statement sent through ``engine`` (an AsyncEngine)."""
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _started(conn, cursor, statement, parameters, context, executemany) -> None:
+        if context is not None:
+            context._metrics_started = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _finished(conn, cursor, statement, parameters, context, executemany) -> None:
+        verb = _verb(statement)
+        sql_statements.inc(verb)
+        started = getattr(context, "_metrics_started", None)
+        if started is not None:
+            sql_duration.observe(time.perf_counter() - started, verb)
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _failed(exception_context) -> None:
+        sql_errors.inc(_verb(exception_context.statement or ""))
+
+
+def render() -> str:
+    return registry.render()
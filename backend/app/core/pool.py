@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core import metrics
+
+# Upper bounds (seconds) of the checkout wait histogram buckets
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# A wait is the time ``connect()`` takes to hand out a connection: time
+# queued behind other requests when the pool is exhausted, plus opening or
+# pre-pinging the connection. A healthy pool answers nearly everything in the
+# first bucket; a fat tail means requests are queueing for connections.
+checkout_wait = metrics.registry.histogram(
+    "db_pool_checkout_wait_seconds", "Time spent obtaining a pooled connection", buckets=WAIT_BUCKETS
+)
+checkout_timeouts = metrics.registry.counter(
+    "db_pool_checkout_timeouts_total", "Checkouts that gave up after db_pool_timeout"
+)
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """The engine's default async pool, timing every checkout."""
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            checkout_timeouts.inc()
+            raise
+        finally:
+            checkout_wait.observe(time.perf_counter() - started)
+
+    def snapshot(self) -> dict:
+        return {
+            "size": self.size(),
+            "max_overflow": self._max_overflow,
+            "checked_out": self.checkedout(),
+            "idle": self.checkedin(),
+            # Negative while the pool hasn't opened all of its base connections yet
+            "overflow": max(self.overflow(), 0),
+            "timeouts": int(checkout_timeouts.values.get((), 0)),
+            "wait_seconds": checkout_wait.snapshot(),
+        }
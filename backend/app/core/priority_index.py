@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+import time
+import uuid
+from typing import Iterable, Optional
+
+# (priority weight, ordering_index, task id, entry sequence)
+Entry = tuple[int, float, uuid.UUID, int]
+
+
+class PriorityIndex:
+    """Per-worker heaps of actionable tasks in next-best order.
+
+    Ordered like ``priority_order_query``: priority weight, then board
+    position, then id. One heap holds every task and one heap per owner holds
+    that owner's, so "top K" with or without an owner filter walks a single
+    heap in O(K log K) without popping it.
+
+    Updates never search the heaps: a changed task gets a fresh entry and
+    the old one is left behind, recognised as dead by its sequence number
+    and skipped on reads. Heaps are rebuilt once dead entries outnumber live
+    ones.
+
+    Only touched from the event loop thread, so no locking is needed.
+    """
+
+    def __init__(self, weights: dict[str, int]) -> None:
+        self.weights = weights
+        self._live: dict[uuid.UUID, tuple[int, Optional[str]]] = {}  # id -> (entry sequence, owner)
+        self._heap: list[Entry] = []
+        self._by_owner: dict[Optional[str], list[Entry]] = {}
+        self._sequence = itertools.count()
+        self._dead = 0
+        # Delta sync watermark the contents are current to; None until loaded
+        self.watermark: Optional[int] = None
+        self.synced_at = 0.0
+        self.syncing = False
+        self.compactions = 0
+
+    @property
+    def loaded(self) -> bool:
+        return self.watermark is not None
+
+    def __len__(self) -> int:
+        return len(self._live)
+
+    def load(self, rows: Iterable, watermark: int) -> None:
+        """Replace the contents with ``rows`` (id, priority, ordering_index, owner)."""
+        self.clear()
+        for row in rows:
+            self._add(row.id, row.priority, row.ordering_index, row.owner, push=False)
+        self._rebuild()
+        self.mark_synced(watermark)
+
+    def upsert(self, task_id: uuid.UUID, priority: str, ordering_index: float, owner: Optional[str]) -> None:
+        if task_id in self._live:
+            self.discard(task_id)
+        self._add(task_id, priority, ordering_index, owner, push=True)
+
+    def discard(self, task_id: uuid.UUID) -> None:
+        if self._live.pop(task_id, None) is not None:
+            self._dead += 2  # its entry in the global heap and in its owner's
+            if self._dead > 2 * len(self._live) + 1024:
+                self._rebuild()
+                self.compactions += 1
+
+    def top(self, k: int, owner: Optional[str] = None) -> list[uuid.UUID]:
+        """Ids of the first ``k`` tasks, optionally only those owned by ``owner``."""
+        heap = self._heap if owner is None else self._by_owner.get(owner, [])
+        found: list[uuid.UUID] = []
+        # Best-first walk of the heap as a tree: a node's children are never
+        # better than the node itself.
+        frontier = [(heap[0], 0)] if heap else []
+        while frontier and len(found) < k:
+            entry, position = heapq.heappop(frontier)
+            if self._live.get(entry[2], (None,))[0] == entry[3]:
+                found.append(entry[2])
+            for child in (2 * position + 1, 2 * position + 2):
+                if child < len(heap):
+                    heapq.heappush(frontier, (heap[child], child))
+        return found
+
+    def mark_synced(self, watermark: int) -> None:
+        self.watermark = watermark
+        self.synced_at = time.monotonic()
+
+    def clear(self) -> None:
+        self._live.clear()
+        self._heap = []
+        self._by_owner = {}
+        self._dead = 0
+        self.watermark = None
+
+    def stats(self) -> dict:
+        return {
+            "loaded": self.loaded,
+            "tasks": len(self._live),
+            "owners": len(self._by_owner),
+            "dead_entries": self._dead,
+            "compactions": self.compactions,
+            "watermark": self.watermark,
+            "seconds_since_sync": round(time.monotonic() - self.synced_at, 3) if self.loaded else None,
+        }
+
+    def _add(self, task_id: uuid.UUID, priority: str, ordering_index: float, owner: Optional[str], push: bool) -> None:
+        sequence = next(self._sequence)
+        entry = (self.weights[priority], ordering_index, task_id, sequence)
+        self._live[task_id] = (sequence, owner)
+        owned = self._by_owner.setdefault(owner, [])
+        if push:
+            heapq.heappush(self._heap, entry)
+            heapq.heappush(owned, entry)
+        else:
+            self._heap.append(entry)
+            owned.append(entry)
+
+    def _rebuild(self) -> None:
+        # Drop dead entries and restore the heap property in O(n)
+        live = self._live
+        self._heap = [entry for entry in self._heap if live.get(entry[2], (None,))[0] == entry[3]]
+        heapq.heapify(self._heap)
+        by_owner: dict[Optional[str], list[Entry]] = {}
+        for entry in self._heap:
+            by_owner.setdefault(live[entry[2]][1], []).append(entry)
+        for owned in by_owner.values():
+            heapq.heapify(owned)
+        self._by_owner = by_owner
+        self._dead = 0
@@ -0,0 +1,148 @@
+"""Per-request SQL statement counts and per-route statement budgets.
+
+Every statement the engine sends is counted against the request that
+issued it (a context variable, so concurrent requests don't mix and the
+count follows the request into SQLAlchemy's greenlets). Routes declare
+what they are expected to cost with ``@query_budget(n)``; the middleware
+compares the count with the budget when the response starts:
+
+* over budget: a warning is logged, or with ``QUERY_BUDGET_STRICT=true``
+  (tests, CI, the route benchmark) the request fails with a 500, so a
+  change that adds a query to a hot path cannot go unnoticed;
+* with ``QUERY_COUNT_HEADERS=true`` every response carries
+  ``X-Query-Count`` (and ``X-Query-Budget`` where one is declared).
+
+Outside of requests, ``count_queries()`` and ``assert_max_queries(n)``
+measure any block of code, e.g. a service call in a test.
+"""
+from __future__ import annotations
+
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator, Optional, TypeVar
+
+from sqlalchemy import event
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+QUERY_COUNT_HEADER = "X-Query-Count"
+QUERY_BUDGET_HEADER = "X-Query-Budget"
+
+Endpoint = TypeVar("Endpoint", bound=Callable)
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class QueryCount:
+    __slots__ = ("statements",)
+
+    def __init__(self) -> None:
+        self.statements = 0
+
+
+_current: ContextVar[Optional[QueryCount]] = ContextVar("query_count", default=None)
+
+
+def instrument_engine(engine) -> None:
+    """Count statements sent through ``engine`` (an AsyncEngine) for the active counter."""
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _count(conn, cursor, statement, parameters, context, executemany) -> None:
+        count = _current.get()
+        if count is not None:
+            count.statements += 1
+
+
+@contextmanager
+def count_queries() -> Iterator[QueryCount]:
+    """Count the statements run inside the block (nested blocks count separately)."""
+    count = QueryCount()
+    token = _current.set(count)
+    try:
+        yield count
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def uncounted() -> Iterator[None]:
+    """Leave the block's statements out of the current count.
+
+    For rare, amortized maintenance that happens to run inside a request
+    (renumbering a column), which budgets deliberately don't price in.
+    """
+    token = _current.set(None)
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def assert_max_queries(limit: int, label: str = "block") -> Iterator[QueryCount]:
+    with count_queries() as count:
+        yield count
+    if count.statements > limit:
+        raise QueryBudgetExceeded(f"{label} ran {count.statements} statements, budget is {limit}")
+
+
+def query_budget(limit: int) -> Callable[[Endpoint], Endpoint]:
+    """Declare how many statements a route may run per request.
+
+    Goes *below* the router decorator so FastAPI registers the marked
+    function::
+
+        @router.patch("/{task_id}", response_model=TaskRead)
+        @query_budget(7)
+        async def update_task(...):
+    """
+
+    def mark(endpoint: Endpoint) -> Endpoint:
+        endpoint.query_budget = limit  # type: ignore[attr-defined]
+        return endpoint
+
+    return mark
+
+
+class QueryCountMiddleware:
+    """Opens a counter per HTTP request and checks it against the route's budget."""
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with count_queries() as count:
+
+            async def send_checked(message) -> None:
+                if message["type"] == "http.response.start":
+                    # The body is rendered by now, so the count is final
+                    # (streaming responses excepted; they declare no budget).
+                    budget = getattr(getattr(scope.get("route"), "endpoint", None), "query_budget", None)
+                    if budget is not None and count.statements > budget:
+                        _over_budget(scope, count.statements, budget)
+                    if settings.query_count_headers:
+                        headers = list(message.get("headers", []))
+                        headers.append((QUERY_COUNT_HEADER.lower().encode(), str(count.statements).encode()))
+                        if budget is not None:
+                            headers.append((QUERY_BUDGET_HEADER.lower().encode(), str(budget).encode()))
+                        message = {**message, "headers": headers}
+                await send(message)
+
+            await self.app(scope, receive, send_checked)
+
+
+def _over_budget(scope, statements: int, budget: int) -> None:
+    message = f"{scope['method']} {scope['route'].path} ran {statements} statements, budget is {budget}"
+    if settings.query_budget_strict:
+        raise QueryBudgetExceeded(message)
+    logger.warning(message)
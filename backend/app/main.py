@@ -1,12 +1,36 @@
+import logging
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.router import api_router
+from app.core import metrics, query_count
+from app.core.auth_cache import principal_cache
 from app.core.config import get_settings
+from app.core.db import AsyncSessionLocal, pool_stats
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.services import ordering_service, partition_service, queue_service
+from app.services.event_service import board_events
 
+logger = logging.getLogger(__name__)
 settings = get_settings()
 
-app = FastAPI(title=settings.app_name)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    try:
+        async with AsyncSessionLocal() as session:
+            await partition_service.ensure_upcoming_partitions(session)
+    except Exception:
+        # Activities outside any monthly partition land in the default one
+        logger.exception("Could not create upcoming activities partitions")
+    yield
+    await board_events.stop()
+
+
+app = FastAPI(title=settings.app_name, lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -14,7 +38,11 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag", query_count.QUERY_COUNT_HEADER, query_count.QUERY_BUDGET_HEADER],
 )
+app.add_middleware(query_count.QueryCountMiddleware)
+# Outermost, so the timing covers every other middleware too
+app.add_middleware(metrics.MetricsMiddleware)
 
 app.include_router(api_router, prefix=settings.api_prefix)
 
@@ -22,3 +50,19 @@ app.include_router(api_router, prefix=settings.api_prefix)
 @app.get("/health")
 async def health():
     return {"status": "ok"}
+
+
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/stats")
+async def stats():
+    return {
+        "auth_cache": principal_cache.stats(),
+        "ordering": ordering_service.stats(),
+        "events": board_events.stats(),
+        "priority_index": queue_service.priority_index.stats(),
+        "db_pool": pool_stats(),
+    }
@@ -3,5 +3,6 @@ from app.models.task import Task
 from app.models.activity import Activity
 from app.models.comment import Comment
 from app.models.user import User
+from app.models.tombstone import TaskTombstone
 
-__all__ = ["Base", "Task", "Activity", "Comment", "User"]
+__all__ = ["Base", "Task", "Activity", "Comment", "User", "TaskTombstone"]
@@ -5,7 +5,7 @@ from datetime import datetime
 from enum import Enum
 from typing import TYPE_CHECKING
 
-from sqlalchemy import DateTime, Enum as PgEnum, ForeignKey, Integer, String
+from sqlalchemy import DateTime, Enum as PgEnum, ForeignKey, Index, Integer, String, func
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -24,21 +24,37 @@ class ActivityType(str, Enum):
 
 
 class Activity(Base):
+    """Append-only task history, range partitioned by month on ``created_at``.
+
+    See partition_service for how partitions are created and archived.
+    """
+
     __tablename__ = "activities"
 
+    # The partition key is part of the primary key, as Postgres requires
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     task_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("tasks.id", ondelete="CASCADE"), nullable=False)
     type: Mapped[str] = mapped_column(String(50), nullable=False)
     payload: Mapped[dict] = mapped_column(JSONB, nullable=False, default=dict)
     actor: Mapped[str] = mapped_column(String(120), nullable=False)
     activity_seq: Mapped[int] = mapped_column(Integer, nullable=False)
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), primary_key=True, default=datetime.utcnow, server_default=func.now()
+    )
 
     task: Mapped["Task"] = relationship("Task", back_populates="activities")
 
     __table_args__ = (
-        # Monotonic sequence per task ensures deterministic ordering
+        # Monotonic sequence per task ensures deterministic ordering. Not
+        # unique: a unique index would have to include created_at; the
+        # sequence comes from tasks.last_activity_seq, which never repeats.
+        Index("ix_activities_task_id_activity_seq", "task_id", "activity_seq"),
+        # Keyset pagination of the global feed
+        Index("ix_activities_created_at_id", "created_at", "id"),
+        # The same feed filtered to one activity type
+        Index("ix_activities_type_created_at_id", "type", "created_at", "id"),
         {
             "sqlite_autoincrement": True,
+            "postgresql_partition_by": "RANGE (created_at)",
         },
     )
@@ -4,7 +4,7 @@ import uuid
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import DateTime, ForeignKey, String, Text
+from sqlalchemy import DateTime, ForeignKey, Index, String, Text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -25,3 +25,8 @@ class Comment(Base):
     version: Mapped[int] = mapped_column(default=1)
 
     task: Mapped["Task"] = relationship("Task", back_populates="comments")
+
+    __table_args__ = (
+        # A task's thread, newest first; also serves the ON DELETE CASCADE lookup
+        Index("ix_comments_task_id_created_at", "task_id", "created_at"),
+    )
@@ -4,7 +4,7 @@ import uuid
 from datetime import datetime
 from typing import Optional, TYPE_CHECKING
 
-from sqlalchemy import CheckConstraint, DateTime, Enum, Float, Integer, String, Text
+from sqlalchemy import BigInteger, CheckConstraint, DateTime, Enum, Float, Index, Integer, String, Text, literal_column, text
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -14,6 +14,12 @@ if TYPE_CHECKING:
     from app.models.activity import Activity
     from app.models.comment import Comment
 
+# Columns the work queue picks from
+ACTIONABLE_STATUSES = ("Ready", "In Progress")
+
+# 64-bit id of the writing transaction (xid8, epoch-extended so it never wraps)
+CURRENT_XID_SQL = "pg_current_xact_id()::text::bigint"
+
 
 class Priority(str, Enum):
     P0 = "P0"
@@ -45,6 +51,20 @@ class Task(Base):
     tags: Mapped[dict] = mapped_column(JSONB, nullable=False, default=dict)
     estimate: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     version: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
+    # Last activity_seq handed out for this task; bumped atomically by log_activity
+    last_activity_seq: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    # Transaction that last wrote the row; delta sync scans it against a snapshot watermark
+    change_xid: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+        server_default=text(CURRENT_XID_SQL),
+        onupdate=literal_column(CURRENT_XID_SQL),
+    )
+    # Work queue lease: who claimed the task and until when. A lapsed lease
+    # simply stops counting; claim_next_task hands the task out again.
+    lease_owner: Mapped[Optional[str]] = mapped_column(String(120), nullable=True)
+    lease_token: Mapped[Optional[uuid.UUID]] = mapped_column(UUID(as_uuid=True), nullable=True)
+    lease_expires_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow
@@ -55,6 +75,18 @@ class Task(Base):
 
     __table_args__ = (
         CheckConstraint("ordering_index >= 0", name="ck_tasks_ordering_index_nonnegative"),
+        # Board columns: ORDER BY ordering_index, id within a status
+        Index("ix_tasks_status_ordering_index_id", "status", "ordering_index", "id"),
+        # Delta sync: WHERE change_xid >= :since
+        Index("ix_tasks_change_xid", "change_xid"),
+        # Work queue: actionable tasks by priority, then board position
+        Index(
+            "ix_tasks_actionable_priority",
+            "priority",
+            "ordering_index",
+            "id",
+            postgresql_where=text("status IN ('Ready', 'In Progress')"),
+        ),
     )
 
     def bump_version(self) -> None:
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, Index, text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+from app.models.task import CURRENT_XID_SQL
+
+
+class TaskTombstone(Base):
+    """Marker left behind by a hard-deleted task so delta sync can report it."""
+
+    __tablename__ = "task_tombstones"
+
+    # No FK: the task row is gone by the time anyone reads this
+    task_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    deleted_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow)
+    change_xid: Mapped[int] = mapped_column(BigInteger, nullable=False, server_default=text(CURRENT_XID_SQL))
+
+    __table_args__ = (
+        Index("ix_task_tombstones_change_xid", "change_xid"),
+    )
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+from app.schemas.task import Status, TaskRead
+
+
+class ClaimRequest(BaseModel):
+    # Defaults to QUEUE_LEASE_SECONDS; capped at QUEUE_MAX_LEASE_SECONDS
+    lease_seconds: Optional[int] = Field(None, ge=1)
+
+
+class HeartbeatRequest(BaseModel):
+    lease_token: uuid.UUID
+    lease_seconds: Optional[int] = Field(None, ge=1)
+
+
+class CompleteRequest(BaseModel):
+    lease_token: uuid.UUID
+    # Column the finished task moves to
+    status: Status = "Done"
+
+
+class ReleaseRequest(BaseModel):
+    lease_token: uuid.UUID
+
+
+class LeaseRead(BaseModel):
+    task_id: uuid.UUID
+    lease_owner: str
+    lease_token: uuid.UUID
+    lease_expires_at: datetime
+
+
+class ClaimResponse(LeaseRead):
+    task: TaskRead
@@ -26,6 +26,19 @@ class TaskCreate(TaskBase):
     pass
 
 
+class CommentImport(BaseModel):
+    body: str
+    actor: str
+    created_at: Optional[datetime] = None
+
+
+class TaskImport(TaskBase):
+    """One record of a bulk import; ordering_index is assigned by the server."""
+    id: Optional[uuid.UUID] = None
+    comments: list[CommentImport] = Field(default_factory=list)
+    created_at: Optional[datetime] = None
+
+
 class TaskUpdate(BaseModel):
     title: Optional[str] = None
     description: Optional[str] = None
@@ -48,12 +61,58 @@ class TaskRead(TaskBase):
         from_attributes = True
 
 
+class TaskSummary(BaseModel):
+    """Board card: everything in TaskRead except the description body."""
+    id: uuid.UUID
+    title: str
+    status: Status
+    priority: Priority
+    owner: Optional[str] = None
+    tags: dict = Field(default_factory=dict)
+    estimate: Optional[int] = None
+    ordering_index: float
+    version: int
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class BoardColumn(BaseModel):
+    status: Status
+    total: int
+    # total comes from table statistics rather than a count
+    total_estimated: bool = False
+    tasks: list[TaskSummary]
+
+
+class BoardWindow(BaseModel):
+    columns: list[BoardColumn]
+
+
+class TaskChanges(BaseModel):
+    # Pass back as ?since= on the next call
+    watermark: int
+    tasks: list[TaskRead]
+    deleted: list[uuid.UUID]
+
+
 class ReorderRequest(BaseModel):
     new_status: Optional[str] = None
     new_ordering_index: float
     if_match: int
 
 
+class MoveRequest(BaseModel):
+    new_status: Optional[Status] = None
+    # Card the task should land directly below / directly above. Either may be
+    # omitted; with neither, the task goes to the end of the column.
+    after_id: Optional[uuid.UUID] = None
+    before_id: Optional[uuid.UUID] = None
+    if_match: int
+
+
 class BulkUpdateRequest(BaseModel):
     task_ids: list[uuid.UUID]
     versions: dict[uuid.UUID, int] = Field(default_factory=dict)
@@ -1,19 +1,53 @@
 from __future__ import annotations
 
 import uuid
-from typing import Any
+from datetime import datetime, timedelta
+from typing import Any, Optional, Sequence
 
-from sqlalchemy import func, select
+from sqlalchemy import ScalarSelect, Table, Update, delete, func, insert, select, tuple_, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core import metrics
+from app.core.config import get_settings
 from app.models.activity import Activity
+from app.models.task import Task
+from app.services import event_service
+
+settings = get_settings()
+
+# A task's activities are logged under its row lock, so created_at follows
+# activity_seq up to how long a write waited for that lock and the clock
+# differences between workers. The per-task feed leaves this much room for
+# both when it bounds created_at; partitions are monthly, so the margin
+# costs next to nothing in pruning.
+TASK_FEED_CLOCK_SLACK = timedelta(days=1)
+
+
+def _bump_activity_seq(task_id: uuid.UUID) -> Update:
+    # updated_at and change_xid are carried over explicitly so that logging
+    # history is not mistaken for an edit of the task itself.
+    return (
+        update(Task)
+        .where(Task.id == task_id)
+        .values(
+            last_activity_seq=Task.last_activity_seq + 1,
+            updated_at=Task.updated_at,
+            change_xid=Task.change_xid,
+        )
+        .returning(Task.last_activity_seq)
+    )
 
 
 async def next_activity_seq(session: AsyncSession, task_id: uuid.UUID) -> int:
+    """Reserve the next activity_seq for a task.
+
+    The UPDATE takes the task's row lock, so concurrent writers are serialized
+    until commit instead of reading the same MAX().
+    """
     result = await session.execute(
-        select(func.coalesce(func.max(Activity.activity_seq), 0)).where(Activity.task_id == task_id)
+        _bump_activity_seq(task_id), execution_options={"synchronize_session": False}
     )
-    return result.scalar_one() + 1
+    return result.scalar_one()
 
 
 async def log_activity(
@@ -24,14 +58,184 @@ async def log_activity(
     type: str,
     payload: dict[str, Any],
 ) -> Activity:
-    seq = await next_activity_seq(session, task_id)
-    activity = Activity(
-        task_id=task_id,
-        actor=actor,
-        type=type,
-        payload=payload,
-        activity_seq=seq,
-    )
-    session.add(activity)
     await session.flush()
+    # Counter bump and insert go out as one statement:
+    # WITH seq AS (UPDATE tasks ... RETURNING) INSERT INTO activities ...
+    seq = _bump_activity_seq(task_id).cte("seq")
+    stmt = (
+        insert(Activity)
+        .add_cte(seq)
+        .values(
+            id=uuid.uuid4(),
+            task_id=task_id,
+            actor=actor,
+            type=type,
+            payload=payload,
+            activity_seq=select(seq.c.last_activity_seq).scalar_subquery(),
+        )
+        .returning(Activity)
+    )
+    result = await session.scalars(stmt)
+    activity = result.one()
+    metrics.activities_logged.inc(type)
+    event_service.activity_logged(session, activity)
+    return activity
+
+
+async def log_activities(session: AsyncSession, rows: list[dict[str, Any]]) -> None:
+    """Insert pre-sequenced activities in one multi-row INSERT.
+
+    Callers reserve ``activity_seq`` themselves, typically by bumping
+    ``tasks.last_activity_seq`` in the same statement that changed the task.
+    """
+    if not rows:
+        return
+    rows = [{"id": uuid.uuid4(), "created_at": datetime.utcnow(), **row} for row in rows]
+    await session.execute(insert(Activity), rows)
+    for row in rows:
+        metrics.activities_logged.inc(row["type"])
+        event_service.activity_logged(session, Activity(**row))
+
+
+def _coalesce_window_start():
+    # now() is the transaction's start time, so every statement of a write
+    # sees the same window
+    return func.now() - timedelta(seconds=settings.activity_coalesce_seconds)
+
+
+def coalescible_payload(task: Table, actor: str) -> Optional[ScalarSelect]:
+    """Payload of the task's latest activity if an ``updated`` one by ``actor`` would merge into it.
+
+    A scalar subquery correlated to ``task``, a ``tasks`` alias holding the
+    row as it was before the write: it is NULL unless that row's last
+    activity is an ``updated`` by the same actor, first written less than
+    ``activity_coalesce_seconds`` ago. None when coalescing is disabled.
+    """
+    if settings.activity_coalesce_seconds <= 0:
+        return None
+    return (
+        select(Activity.payload)
+        .where(
+            Activity.task_id == task.c.id,
+            Activity.activity_seq == task.c.last_activity_seq,
+            Activity.type == "updated",
+            Activity.actor == actor,
+            Activity.created_at >= _coalesce_window_start(),
+        )
+        .correlate(task)
+        .scalar_subquery()
+    )
+
+
+def merge_updated_payloads(earlier: dict[str, Any], later: dict[str, Any]) -> dict[str, Any]:
+    """Combine two ``updated`` payloads: the first ``old_*`` and the last of everything else.
+
+    Pairs that end up back where they started (a priority toggled there and
+    back) are dropped.
+    """
+    merged = {**earlier, **later}
+    for key, value in earlier.items():
+        if key.startswith("old_"):
+            merged[key] = value
+    for key in [key for key in merged if key.startswith("old_")]:
+        new = "new_" + key.removeprefix("old_")
+        if new in merged and merged[new] == merged[key]:
+            del merged[key], merged[new]
+    return merged
+
+
+async def coalesce_activity(
+    session: AsyncSession, *, task_id: uuid.UUID, activity_seq: int, type: str, payload: dict[str, Any]
+) -> Optional[Activity]:
+    """Replace the payload of an activity found by ``coalescible_payload``.
+
+    The row keeps its id, sequence number and created_at, so feeds and
+    cursors don't see it move, and a burst of edits never spans more than
+    one window. An empty ``payload`` (every field back where it started)
+    deletes the row instead, leaving a gap in the task's activity_seq;
+    returns None then. Callers hold the task's row lock from the same
+    transaction, so nothing else can have been logged for the task in
+    between.
+    """
+    conditions = (
+        Activity.task_id == task_id,
+        Activity.activity_seq == activity_seq,
+        Activity.type == type,
+        # Only lets the planner skip the partitions of past months
+        Activity.created_at >= _coalesce_window_start(),
+    )
+    metrics.activities_coalesced.inc(type)
+    if not payload:
+        result = await session.execute(
+            delete(Activity).where(*conditions).returning(Activity.id),
+            execution_options={"synchronize_session": False},
+        )
+        event_service.activity_withdrawn(session, result.scalar_one(), task_id)
+        return None
+    stmt = update(Activity).where(*conditions).values(payload=payload).returning(Activity)
+    result = await session.scalars(stmt, execution_options={"synchronize_session": False})
+    activity = result.one()
+    event_service.activity_coalesced(session, activity)
     return activity
+
+
+async def list_activities(
+    session: AsyncSession,
+    *,
+    limit: int,
+    offset: int = 0,
+    after: tuple[datetime, uuid.UUID] | None = None,
+    type: str | None = None,
+    exclude_type: str | None = None,
+) -> Sequence[Activity]:
+    """Global feed, newest first. ``after`` is the (created_at, id) key of the last row already seen."""
+    stmt = select(Activity).order_by(Activity.created_at.desc(), Activity.id.desc())
+    if type:
+        stmt = stmt.where(Activity.type == type)
+    if exclude_type:
+        stmt = stmt.where(Activity.type != exclude_type)
+    if after is not None:
+        # The plain created_at bound is implied by the row comparison, but
+        # only it lets the planner skip the monthly partitions past the cursor
+        stmt = stmt.where(tuple_(Activity.created_at, Activity.id) < tuple_(*after), Activity.created_at <= after[0])
+    elif offset:
+        stmt = stmt.offset(offset)
+    result = await session.execute(stmt.limit(limit))
+    return result.scalars().all()
+
+
+async def list_task_activities(
+    session: AsyncSession,
+    task_id: uuid.UUID,
+    *,
+    limit: int,
+    offset: int = 0,
+    before: tuple[int, datetime] | None = None,
+    exclude_type: str | None = None,
+) -> Sequence[Activity]:
+    """Per-task feed, newest first. ``before`` is the (activity_seq, created_at) of the last row already seen.
+
+    activity_seq is not the partition key, so the query also bounds
+    created_at to let the planner skip months the task has no history in:
+    from the task's creation (capped at now, for imports dated ahead) to
+    now, or to the cursor row on later pages.
+    """
+    created = select(func.least(Task.created_at, func.now())).where(Task.id == task_id).scalar_subquery()
+    newest = before[1] if before is not None else func.now()
+    stmt = (
+        select(Activity)
+        .where(
+            Activity.task_id == task_id,
+            Activity.created_at >= created - TASK_FEED_CLOCK_SLACK,
+            Activity.created_at <= newest + TASK_FEED_CLOCK_SLACK,
+        )
+        .order_by(Activity.activity_seq.desc())
+    )
+    if exclude_type:
+        stmt = stmt.where(Activity.type != exclude_type)
+    if before is not None:
+        stmt = stmt.where(Activity.activity_seq < before[0])
+    elif offset:
+        stmt = stmt.offset(offset)
+    result = await session.execute(stmt.limit(limit))
+    return result.scalars().all()
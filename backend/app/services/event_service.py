@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import uuid
+from typing import Any, Optional
+
+import asyncpg
+from sqlalchemy import Text, func, literal, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.db import before_commit, transaction_state
+from app.schemas.activity import ActivityRead
+from app.schemas.comment import CommentRead
+from app.schemas.task import TaskSummary
+from app.services import revision_service
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "board_events"
+# Postgres rejects NOTIFY payloads of 8000 bytes or more
+MAX_NOTIFY_BYTES = 7900
+
+_PENDING_EVENTS = "board_events"
+
+
+# --- Publishing (write paths) -------------------------------------------------
+
+def queue_event(session: AsyncSession, type: str, data: dict[str, Any]) -> None:
+    """Queue a board delta; it is NOTIFYed with the transaction's COMMIT.
+
+    NOTIFY is transactional, so listeners only ever see deltas of committed
+    writes, and a rolled back request publishes nothing. Every board delta
+    also advances the board revision used for conditional GETs.
+    """
+    transaction_state(session).setdefault(_PENDING_EVENTS, []).append({"type": type, **data})
+    before_commit(session, _publish_pending)
+    revision_service.mark_changed(session)
+
+
+def task_upserted(session: AsyncSession, task: Any) -> None:
+    queue_event(session, "task.upserted", {"task": TaskSummary.model_validate(task).model_dump(mode="json")})
+
+
+def task_deleted(session: AsyncSession, task_id: uuid.UUID) -> None:
+    queue_event(session, "task.deleted", {"task_id": str(task_id)})
+
+
+def activity_logged(session: AsyncSession, activity: Any) -> None:
+    queue_event(session, "activity.created", {"activity": ActivityRead.model_validate(activity).model_dump(mode="json")})
+
+
+def activity_coalesced(session: AsyncSession, activity: Any) -> None:
+    queue_event(session, "activity.updated", {"activity": ActivityRead.model_validate(activity).model_dump(mode="json")})
+
+
+def activity_withdrawn(session: AsyncSession, activity_id: uuid.UUID, task_id: uuid.UUID) -> None:
+    queue_event(session, "activity.deleted", {"activity_id": str(activity_id), "task_id": str(task_id)})
+
+
+def comment_created(session: AsyncSession, comment: Any) -> None:
+    queue_event(session, "comment.created", {"comment": CommentRead.model_validate(comment).model_dump(mode="json")})
+
+
+def _encode(event: dict[str, Any]) -> str:
+    encoded = json.dumps(event, separators=(",", ":"), default=str)
+    if len(encoded.encode()) <= MAX_NOTIFY_BYTES:
+        return encoded
+    # Too large to ship (e.g. a huge comment body): send a stub that tells
+    # clients which entity to refetch.
+    entity = next((event[key] for key in ("task", "activity", "comment") if key in event), {})
+    stub = {
+        "type": event["type"],
+        "truncated": True,
+        "id": entity.get("id"),
+        "task_id": entity.get("task_id", entity.get("id")),
+    }
+    return json.dumps(stub, separators=(",", ":"))
+
+
+async def _publish_pending(session: AsyncSession) -> None:
+    events = transaction_state(session).pop(_PENDING_EVENTS, None)
+    if not events:
+        return
+    # Pack as many events per NOTIFY as fit, then send all chunks in a single
+    # statement: SELECT pg_notify(channel, p) FROM unnest(:payloads) AS p
+    chunks: list[str] = []
+    batch: list[str] = []
+    size = 2
+    for encoded in map(_encode, events):
+        if batch and size + len(encoded.encode()) + 1 > MAX_NOTIFY_BYTES:
+            chunks.append("[" + ",".join(batch) + "]")
+            batch, size = [], 2
+        batch.append(encoded)
+        size += len(encoded.encode()) + 1
+    chunks.append("[" + ",".join(batch) + "]")
+
+    payloads = func.unnest(literal(chunks, ARRAY(Text))).table_valued("payload").render_derived(name="chunks")
+    await session.execute(select(func.pg_notify(CHANNEL, payloads.c.payload)).select_from(payloads))
+
+
+# --- Fan-out (stream endpoint) -----------------------------------------------
+
+class Subscription:
+    """One connected client. Reads ``None`` when the stream should end."""
+
+    def __init__(self, maxsize: int) -> None:
+        self.queue: asyncio.Queue[Optional[dict[str, Any]]] = asyncio.Queue(maxsize=maxsize)
+        self.closed = False
+
+    def offer(self, event: dict[str, Any]) -> None:
+        if self.closed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Backpressure policy: a client that cannot keep up loses its
+            # backlog and is told to resync; it reconnects and refetches
+            # instead of making the worker buffer without bound.
+            self.close(resync=True)
+
+    def close(self, *, resync: bool = False) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        if resync:
+            self.queue.put_nowait({"type": "resync"})
+        self.queue.put_nowait(None)
+
+    async def get(self) -> Optional[dict[str, Any]]:
+        return await self.queue.get()
+
+
+class BoardEventBroker:
+    """Per-worker LISTEN connection fanning board deltas out to subscribers.
+
+    Every uvicorn worker runs its own broker, and Postgres NOTIFY delivers
+    each committed delta to all of them, whichever worker wrote it.
+    """
+
+    def __init__(self, dsn: str, queue_size: int) -> None:
+        self.dsn = dsn
+        self.queue_size = queue_size
+        self.subscribers: set[Subscription] = set()
+        self._conn: Optional[asyncpg.Connection] = None
+        self._lock = asyncio.Lock()
+
+    async def subscribe(self) -> Subscription:
+        await self._ensure_listening()
+        subscription = Subscription(self.queue_size)
+        self.subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self.subscribers.discard(subscription)
+        subscription.close()
+
+    async def stop(self) -> None:
+        for subscription in list(self.subscribers):
+            self.unsubscribe(subscription)
+        conn, self._conn = self._conn, None
+        if conn is not None and not conn.is_closed():
+            await conn.close()
+
+    async def _ensure_listening(self) -> None:
+        async with self._lock:
+            if self._conn is not None and not self._conn.is_closed():
+                return
+            conn = await asyncpg.connect(self.dsn)
+            conn.add_termination_listener(self._on_terminated)
+            await conn.add_listener(CHANNEL, self._on_notify)
+            self._conn = conn
+
+    def _on_notify(self, connection, pid, channel, payload: str) -> None:
+        try:
+            events = json.loads(payload)
+        except ValueError:
+            logger.warning("Dropping malformed board event payload")
+            return
+        for subscription in list(self.subscribers):
+            for event in events:
+                subscription.offer(event)
+            if subscription.closed:
+                self.subscribers.discard(subscription)
+
+    def _on_terminated(self, connection) -> None:
+        # Deltas may have been missed; every client has to resync. The next
+        # subscriber reopens the LISTEN connection.
+        self._conn = None
+        for subscription in list(self.subscribers):
+            subscription.close(resync=True)
+        self.subscribers.clear()
+
+    def stats(self) -> dict:
+        return {"subscribers": len(self.subscribers), "listening": self._conn is not None}
+
+
+settings = get_settings()
+board_events = BoardEventBroker(
+    dsn=settings.database_url.replace("+asyncpg", ""),
+    queue_size=settings.event_stream_queue_size,
+)
@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import csv
+import json
+import uuid
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Optional
+
+from pydantic import ValidationError
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import metrics
+from app.core.config import get_settings
+from app.core.db import AsyncSessionLocal
+from app.core.responses import json_bytes
+from app.models.task import Task
+from app.models.tombstone import TaskTombstone
+from app.schemas.task import TaskImport
+from app.services import event_service, ordering_service
+
+settings = get_settings()
+
+TASK_COLUMNS = (
+    "id", "title", "description", "status", "priority", "ordering_index", "owner", "tags",
+    "estimate", "version", "last_activity_seq", "created_at", "updated_at",
+)
+ACTIVITY_COLUMNS = ("id", "task_id", "type", "payload", "actor", "activity_seq", "created_at")
+COMMENT_COLUMNS = ("id", "task_id", "body", "actor", "created_at", "version")
+
+# CSV cells holding JSON documents
+_CSV_JSON_FIELDS = ("tags", "comments")
+
+
+async def import_tasks(
+    lines: AsyncIterator[str], fmt: str, *, actor: str, batch_size: Optional[int] = None
+) -> AsyncIterator[dict[str, Any]]:
+    """Load tasks (with their comments) from NDJSON or CSV lines via COPY.
+
+    Every record is validated against ``TaskImport``; invalid rows are
+    reported and skipped. Valid rows are appended to the end of their
+    column and loaded in batches of ``import_batch_size`` with one COPY per
+    table and one commit per batch, together with a ``created`` activity
+    per task. Each batch holds the column locks of the statuses it appends
+    to while it runs, so moves and appends elsewhere never pick the same
+    index; ordering indexes are handed out in memory from the tails read
+    under them.
+
+    Yields a progress report after each batch (running totals plus that
+    batch's row errors) and a final report with ``"done": True``.
+    """
+    batch_size = batch_size or settings.import_batch_size
+    parse = _parse_csv if fmt == "csv" else _parse_ndjson
+    totals = {"imported": 0, "comments": 0, "failed": 0}
+
+    async with AsyncSessionLocal() as session:
+        batch: list[tuple[int, TaskImport]] = []
+        errors: list[dict[str, Any]] = []
+
+        async def flush() -> dict[str, Any]:
+            nonlocal batch, errors
+            if batch:
+                errors.extend(await _load_batch(session, batch, actor, totals))
+            totals["failed"] += len(errors)
+            report = {**totals, "errors": errors}
+            batch, errors = [], []
+            return report
+
+        async for row, data in parse(lines):
+            if isinstance(data, _Invalid):
+                errors.append({"row": row, "error": data.reason})
+                continue
+            try:
+                batch.append((row, TaskImport.model_validate(data)))
+            except ValidationError as exc:
+                errors.append({"row": row, "error": _describe(exc)})
+            if len(batch) >= batch_size:
+                yield await flush()
+        yield {**(await flush()), "done": True}
+
+
+async def _lock_column_tails(session: AsyncSession, statuses: list[str]) -> dict[str, float]:
+    """Take the column locks of ``statuses`` and read their last index under them."""
+    # In one order, so two imports can't each hold a lock the other waits for
+    statuses = sorted(statuses)
+    await session.execute(select(*(ordering_service.column_lock(status) for status in statuses)))
+    result = await session.execute(
+        select(Task.status, func.max(Task.ordering_index)).where(Task.status.in_(statuses)).group_by(Task.status)
+    )
+    return {status: tail for status, tail in result.all()}
+
+
+async def _load_batch(
+    session: AsyncSession,
+    batch: list[tuple[int, TaskImport]],
+    actor: str,
+    totals: dict[str, int],
+) -> list[dict[str, Any]]:
+    """COPY one batch and commit it; returns row errors if the batch was rejected."""
+    now = datetime.now(timezone.utc)
+    tails = await _lock_column_tails(session, list({item.status for _, item in batch}))
+    tasks: list[tuple] = []
+    activities: list[tuple] = []
+    comments: list[tuple] = []
+    for _, item in batch:
+        task_id = item.id or uuid.uuid4()
+        created_at = _aware(item.created_at) or now
+        tails[item.status] = tails.get(item.status, 0.0) + ordering_service.ORDERING_STEP
+        tasks.append((
+            task_id, item.title, item.description, item.status, item.priority, tails[item.status],
+            item.owner, json_bytes(item.tags).decode(), item.estimate, 1, 1, created_at, now,
+        ))
+        activities.append((
+            uuid.uuid4(), task_id, "created", json_bytes({"title": item.title}).decode(), actor, 1, now,
+        ))
+        comments.extend(
+            (uuid.uuid4(), task_id, comment.body, comment.actor, _aware(comment.created_at) or now, 1)
+            for comment in item.comments
+        )
+
+    connection = await session.connection()
+    raw = (await connection.get_raw_connection()).driver_connection
+    try:
+        await raw.copy_records_to_table("tasks", records=tasks, columns=TASK_COLUMNS)
+        await raw.copy_records_to_table("activities", records=activities, columns=ACTIVITY_COLUMNS)
+        if comments:
+            await raw.copy_records_to_table("comments", records=comments, columns=COMMENT_COLUMNS)
+        restored = [item.id for _, item in batch if item.id is not None]
+        if restored:
+            # A re-created task is live again; delta sync must stop reporting it deleted
+            await session.execute(delete(TaskTombstone).where(TaskTombstone.task_id.in_(restored)))
+        # Too many rows to announce one by one; clients reload the board
+        event_service.queue_event(session, "board.imported", {"tasks": len(tasks)})
+        await session.commit()
+    except Exception as exc:  # asyncpg raises its own error hierarchy here
+        await session.rollback()
+        message = f"Batch rejected by the database: {exc}"
+        return [{"row": row, "error": message} for row, _ in batch]
+
+    metrics.activities_logged.inc("created", amount=len(activities))
+    totals["imported"] += len(tasks)
+    totals["comments"] += len(comments)
+    return []
+
+
+def _aware(value: Optional[datetime]) -> Optional[datetime]:
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _describe(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc']) or 'record'}: {error['msg']}" for error in exc.errors()
+    )
+
+
+async def _parse_ndjson(lines: AsyncIterator[str]) -> AsyncIterator[tuple[int, Any]]:
+    row = 0
+    async for line in lines:
+        if not line.strip():
+            continue
+        row += 1
+        try:
+            data = json.loads(line)
+        except ValueError as exc:
+            data = _Invalid(f"Invalid JSON: {exc}")
+        yield row, data
+
+
+async def _parse_csv(lines: AsyncIterator[str]) -> AsyncIterator[tuple[int, Any]]:
+    header: Optional[list[str]] = None
+    row = 0
+    pending = ""
+    async for line in lines:
+        # A quoted cell may contain newlines; a record is complete once its
+        # quotes are balanced.
+        pending += line if line.endswith("\n") else line + "\n"
+        if pending.count('"') % 2:
+            continue
+        record, pending = pending, ""
+        if not record.strip():
+            continue
+        cells = next(csv.reader([record]))
+        if header is None:
+            header = [name.strip() for name in cells]
+            continue
+        row += 1
+        if len(cells) != len(header):
+            yield row, _Invalid(f"Expected {len(header)} cells, got {len(cells)}")
+            continue
+        data: dict[str, Any] = {name: value for name, value in zip(header, cells) if value != ""}
+        try:
+            for name in _CSV_JSON_FIELDS:
+                if name in data:
+                    data[name] = json.loads(data[name])
+        except ValueError as exc:
+            yield row, _Invalid(f"Invalid JSON in '{name}': {exc}")
+            continue
+        yield row, data
+
+
+class _Invalid:
+    """A record that could not be parsed at all."""
+
+    def __init__(self, reason: str) -> None:
+        self.reason = reason
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import uuid
+from collections import Counter
+
+from sqlalchemy import ColumnElement, exists, func, literal, or_, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.query_count import uncounted
+from app.models.task import Task
+from app.services import event_service
+
+# Spacing used when appending and when renumbering a column
+ORDERING_STEP = 1000.0
+# Closest two cards may sit before their column is renumbered. Far above float
+# precision at realistic index magnitudes, so bisecting never yields a tie.
+MIN_ORDERING_GAP = 1e-6
+
+# Renumbers performed by this worker, per status column
+rebalance_counts: Counter[str] = Counter()
+
+
+def needs_rebalance(
+    status: ColumnElement[str], ordering_index: float | ColumnElement[float], task_id: ColumnElement
+) -> ColumnElement[bool]:
+    """SQL condition: ``ordering_index`` has no usable gap left around it in ``status``.
+
+    An expression rather than a query so a write can evaluate it in its own
+    RETURNING clause, against the row it just wrote. ``ordering_index`` may
+    itself be a column there, when the write computed the index in SQL.
+    """
+    if isinstance(ordering_index, ColumnElement):
+        too_low = ordering_index < MIN_ORDERING_GAP
+    else:
+        too_low = literal(ordering_index < MIN_ORDERING_GAP)
+    others = Task.__table__.alias("others")
+    crowded = (
+        exists()
+        .where(
+            others.c.status == status,
+            others.c.id != task_id,
+            others.c.ordering_index.between(ordering_index - MIN_ORDERING_GAP, ordering_index + MIN_ORDERING_GAP),
+        )
+    )
+    return or_(too_low, crowded)
+
+
+def column_tail(status: str, task_id: ColumnElement) -> ColumnElement[float]:
+    """SQL expression: the ordering_index one step past the last card of ``status``.
+
+    ``task_id`` is left out, so a card already in the column isn't counted
+    as its own predecessor. Only race-free under ``column_lock``.
+    """
+    others = Task.__table__.alias("others")
+    last = select(func.max(others.c.ordering_index)).where(others.c.status == status, others.c.id != task_id)
+    return func.coalesce(last.scalar_subquery(), 0.0) + ORDERING_STEP
+
+
+def column_lock(status: str | ColumnElement[str]) -> ColumnElement:
+    """SQL expression taking the transaction-scoped advisory lock of ``status``.
+
+    Renumbering and appending to a column hold it. Appending reads the
+    column's last index, which no row lock protects: two appends would
+    otherwise both see the same tail and pick the same index. The read has
+    to come in a later statement than the lock to see the previous holder's
+    write.
+
+    Renumbering row-locks every card in the column while holding it, so
+    any writer that also locks task rows takes the column lock first, in a
+    statement of its own; the reverse order deadlocks against a rebalance.
+    ``status`` may be a column, to lock the column a task currently sits in.
+    """
+    return func.pg_advisory_xact_lock(func.hashtext("tasks.ordering:" + status))
+
+
+async def lock_column(session: AsyncSession, status: str) -> None:
+    """Serialize renumbering and appending to ``status`` until the transaction ends."""
+    await session.execute(select(column_lock(status)))
+
+
+async def rebalance_column(session: AsyncSession, status: str) -> int:
+    """Renumber a column to ORDERING_STEP spacing in one statement.
+
+    Relative order (ordering_index, id) is preserved, so ``version`` and
+    ``updated_at`` are left alone; ``change_xid`` still advances so delta
+    sync picks up the new indexes. Concurrent rebalances of the same column
+    are serialized by ``lock_column``; a caller that already holds task row
+    locks must have taken it before them.
+    """
+    await lock_column(session, status)
+    tasks = Task.__table__
+    ranked = (
+        select(
+            tasks.c.id,
+            (func.row_number().over(order_by=(tasks.c.ordering_index, tasks.c.id)) * ORDERING_STEP).label("new_index"),
+        )
+        .where(tasks.c.status == status)
+        .subquery("ranked")
+    )
+    result = await session.execute(
+        update(tasks)
+        .where(tasks.c.id == ranked.c.id, tasks.c.ordering_index != ranked.c.new_index)
+        .values(ordering_index=ranked.c.new_index, updated_at=tasks.c.updated_at)
+    )
+    rebalance_counts[status] += 1
+    # Every card in the column may have a new index; tell clients to reload it
+    event_service.queue_event(session, "column.rebalanced", {"status": status})
+    return result.rowcount
+
+
+async def crowded_columns(session: AsyncSession) -> list[str]:
+    """Status columns whose tightest neighbour gap is below MIN_ORDERING_GAP."""
+    gaps = select(
+        Task.status,
+        (
+            Task.ordering_index
+            - func.lag(Task.ordering_index).over(partition_by=Task.status, order_by=(Task.ordering_index, Task.id))
+        ).label("gap"),
+        Task.ordering_index,
+    ).subquery("gaps")
+    result = await session.execute(
+        select(gaps.c.status)
+        .where((gaps.c.gap < MIN_ORDERING_GAP) | (gaps.c.ordering_index < MIN_ORDERING_GAP))
+        .distinct()
+    )
+    return list(result.scalars())
+
+
+async def rebalance_crowded_columns(session: AsyncSession) -> dict[str, int]:
+    """Background sweep: renumber every column that has run out of gaps."""
+    return {status: await rebalance_column(session, status) for status in await crowded_columns(session)}
+
+
+async def position_between(
+    session: AsyncSession,
+    status: str,
+    task_id: uuid.UUID,
+    *,
+    after: Task | None,
+    before: Task | None,
+) -> float:
+    """ordering_index for ``task_id`` dropped between two cards of ``status``.
+
+    ``after`` is the card that will sit directly above the task and ``before``
+    the one directly below; a missing side is looked up from the column. The
+    caller must hold the column lock of ``status`` (taken before any row
+    lock, see ``column_lock``) and row locks on the given neighbours. A
+    looked-up side has no row lock to rely on: without the column lock a
+    drop after A and one before the card following A would both pick the
+    same midpoint. If the slot has no room left the column is renumbered
+    and the slot recomputed.
+    """
+    lower = after.ordering_index if after is not None else None
+    upper = before.ordering_index if before is not None else None
+    others = select(Task.ordering_index).where(Task.status == status, Task.id != task_id)
+    if after is not None and before is None:
+        result = await session.execute(
+            others.where(tuple_(Task.ordering_index, Task.id) > tuple_(after.ordering_index, after.id))
+            .order_by(Task.ordering_index, Task.id)
+            .limit(1)
+        )
+        upper = result.scalar_one_or_none()
+    elif before is not None and after is None:
+        result = await session.execute(
+            others.where(tuple_(Task.ordering_index, Task.id) < tuple_(before.ordering_index, before.id))
+            .order_by(Task.ordering_index.desc(), Task.id.desc())
+            .limit(1)
+        )
+        lower = result.scalar_one_or_none()
+    elif after is None and before is None:
+        result = await session.execute(select(func.max(Task.ordering_index)).where(Task.status == status, Task.id != task_id))
+        lower = result.scalar_one()
+
+    if lower is None:
+        lower = 0.0
+    if upper is None:
+        return lower + ORDERING_STEP
+    if upper - lower >= 2 * MIN_ORDERING_GAP:
+        return (lower + upper) / 2
+
+    with uncounted():
+        await rebalance_column(session, status)
+        for neighbour in (after, before):
+            if neighbour is not None:
+                await session.refresh(neighbour, attribute_names=["ordering_index"])
+        return await position_between(session, status, task_id, after=after, before=before)
+
+
+def stats() -> dict:
+    return {"rebalances": dict(rebalance_counts)}
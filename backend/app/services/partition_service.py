@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import logging
+import os
+import re
+from datetime import date, datetime, timezone
+from typing import NamedTuple, Optional
+
+import zstandard
+from sqlalchemy import column, func, select, table, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.db import AsyncSessionLocal
+from app.core.responses import json_bytes, row_dicts
+from app.schemas.activity import ActivityRead
+from app.services import event_service
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+PARENT = "activities"
+DEFAULT_PARTITION = "activities_default"
+_MONTHLY = re.compile(r"^activities_(\d{4})_(\d{2})$")
+
+
+class Partition(NamedTuple):
+    name: str
+    month: date
+    # Detached by an archive run that didn't finish; archived on the next one
+    attached: bool
+    # Planner estimate, -1 before the first ANALYZE
+    rows: int
+
+
+class Archived(NamedTuple):
+    name: str
+    path: str
+    rows: int
+
+
+def month_of(moment: date) -> date:
+    if isinstance(moment, datetime) and moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc)
+    return date(moment.year, moment.month, 1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARENT}_{month:%Y_%m}"
+
+
+def _bound(month: date) -> str:
+    # Partition bounds are DDL, which takes no bind parameters
+    return f"'{month.isoformat()}T00:00:00+00:00'"
+
+
+async def list_partitions(session: AsyncSession) -> list[Partition]:
+    """Monthly partitions, oldest first, including ones already detached."""
+    result = await session.execute(
+        text(
+            "SELECT relname, relispartition, reltuples::bigint FROM pg_class "
+            "WHERE relkind = 'r' AND relname ~ '^activities_[0-9]{4}_[0-9]{2}$' ORDER BY relname"
+        )
+    )
+    partitions = []
+    for name, attached, rows in result.all():
+        year, month = _MONTHLY.match(name).groups()
+        partitions.append(Partition(name, date(int(year), int(month), 1), attached, rows))
+    return partitions
+
+
+async def ensure_partitions(session: AsyncSession, first: date, last: date) -> list[str]:
+    """Create the monthly partitions covering ``first`` through ``last``; returns the new ones.
+
+    Rows that landed in the default partition because their month had no
+    partition yet are moved into the new one before it is attached.
+    Concurrent callers (every worker does this at startup) are serialized
+    by a transaction-scoped advisory lock. Commits.
+    """
+    await session.execute(select(func.pg_advisory_xact_lock(func.hashtext("activities.partitions"))))
+    existing = {partition.month for partition in await list_partitions(session)}
+    created = []
+    month, last = month_of(first), month_of(last)
+    while month <= last:
+        upper = add_months(month, 1)
+        if month not in existing:
+            name = partition_name(month)
+            in_month = f"created_at >= {_bound(month)} AND created_at < {_bound(upper)}"
+            await session.execute(text(f"CREATE TABLE {name} (LIKE {PARENT} INCLUDING DEFAULTS)"))
+            moved = await session.execute(text(f"INSERT INTO {name} SELECT * FROM {DEFAULT_PARTITION} WHERE {in_month}"))
+            if moved.rowcount:
+                await session.execute(text(f"DELETE FROM {DEFAULT_PARTITION} WHERE {in_month}"))
+                logger.info(f"Moved {moved.rowcount} activities from {DEFAULT_PARTITION} to {name}")
+            # Builds the partition's indexes and foreign key from the parent's
+            await session.execute(
+                text(f"ALTER TABLE {PARENT} ATTACH PARTITION {name} FOR VALUES FROM ({_bound(month)}) TO ({_bound(upper)})")
+            )
+            created.append(name)
+        month = upper
+    await session.commit()
+    return created
+
+
+async def ensure_upcoming_partitions(session: AsyncSession, now: Optional[datetime] = None) -> list[str]:
+    """Partitions for this month and the next ``activity_partitions_ahead``."""
+    current = month_of(now or datetime.now(timezone.utc))
+    return await ensure_partitions(session, current, add_months(current, settings.activity_partitions_ahead))
+
+
+async def archive_old_partitions(
+    keep_months: int, archive_dir: str, now: Optional[datetime] = None
+) -> list[Archived]:
+    """Detach, export and drop every monthly partition older than ``keep_months``.
+
+    Each partition is detached first (in its own short transaction), so the
+    feed stops seeing it at once, then written to
+    ``<archive_dir>/<partition>.ndjson.zst`` (one ActivityRead per line, as in
+    the NDJSON export) and only dropped once the file is complete. Each
+    detach publishes ``activities.archived`` so clients reload their feeds. A run that
+    dies half-way leaves a detached table behind, which the next run picks
+    up again.
+    """
+    cutoff = add_months(month_of(now or datetime.now(timezone.utc)), -keep_months)
+    async with AsyncSessionLocal() as session:
+        expired = [partition for partition in await list_partitions(session) if partition.month < cutoff]
+
+    archived = []
+    os.makedirs(archive_dir, exist_ok=True)
+    for partition in expired:
+        async with AsyncSessionLocal() as session:
+            if partition.attached:
+                await session.execute(text(f"ALTER TABLE {PARENT} DETACH PARTITION {partition.name}"))
+                # Advances the board revision too, so cached feed pages
+                # holding these rows stop answering 304
+                event_service.queue_event(
+                    session, "activities.archived", {"partition": partition.name, "month": partition.month.isoformat()}
+                )
+                await session.commit()
+            path, rows = await _export(session, partition.name, archive_dir)
+            # The export's cursor ends with its transaction; the table can't
+            # be dropped while it is open
+            await session.commit()
+            await session.execute(text(f"DROP TABLE {partition.name}"))
+            await session.commit()
+        logger.info(f"Archived {rows} activities from {partition.name} to {path}")
+        archived.append(Archived(partition.name, path, rows))
+    return archived
+
+
+async def _export(session: AsyncSession, name: str, archive_dir: str) -> tuple[str, int]:
+    fields = list(ActivityRead.model_fields)
+    source = table(name, *(column(field) for field in fields))
+    query = select(*source.c).order_by(source.c.created_at, source.c.id)
+    path = os.path.join(archive_dir, f"{name}.ndjson.zst")
+    partial = path + ".partial"
+    rows = 0
+    with open(partial, "wb") as handle:
+        with zstandard.ZstdCompressor(level=settings.activity_archive_zstd_level).stream_writer(handle, closefd=False) as writer:
+            result = await session.stream(query.execution_options(yield_per=settings.export_batch_size))
+            async for batch in result.partitions():
+                writer.write(b"".join(json_bytes(record) + b"\n" for record in row_dicts(batch, ActivityRead)))
+                rows += len(batch)
+        handle.flush()
+        os.fsync(handle.fileno())
+    # Only a complete file carries the final name
+    os.replace(partial, path)
+    return path, rows
@@ -1,10 +1,29 @@
 from __future__ import annotations
 
-from sqlalchemy import Select, select
+import asyncio
+import logging
+import time
+import uuid
+from datetime import timedelta
+from typing import Optional, Sequence
+
+from sqlalchemy import ColumnElement, Row, Select, Update, and_, any_, bindparam, case, func, literal_column, or_, select, update
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import defer
 
-from app.models.task import Task
+from app.core import metrics
+from app.core.config import get_settings
+from app.core.db import AsyncSessionLocal
+from app.core.priority_index import PriorityIndex
+from app.core.query_count import uncounted
+from app.models.task import ACTIONABLE_STATUSES, Task
+from app.models.tombstone import TaskTombstone
+from app.services import activity_service, ordering_service
+from app.services.task_service import TaskNotFoundError
 
+logger = logging.getLogger(__name__)
+settings = get_settings()
 
 PRIORITY_WEIGHT = {
     "P0": 0,
@@ -14,6 +33,26 @@ PRIORITY_WEIGHT = {
 }
 
 
+class LeaseLostError(Exception):
+    """The lease token no longer matches: the task was released, completed or claimed again."""
+
+
+def is_actionable() -> ColumnElement[bool]:
+    # Inlined as literals: the planner only uses the partial index
+    # ix_tasks_actionable_priority when it can prove its predicate, which a
+    # bind parameter (under a generic prepared-statement plan) doesn't allow.
+    return Task.status.in_(bindparam("actionable", list(ACTIONABLE_STATUSES), expanding=True, literal_execute=True))
+
+
+def is_claimable() -> ColumnElement[bool]:
+    # Ready and not under a live lease. 'Ready' is inlined for the same
+    # reason as in is_actionable; it implies the partial index's predicate.
+    return and_(
+        Task.status == bindparam("claimable", "Ready", literal_execute=True),
+        or_(Task.lease_expires_at.is_(None), Task.lease_expires_at <= func.now()),
+    )
+
+
 def priority_order_query(base_query: Select | None = None) -> Select:
     query = base_query if base_query is not None else select(Task)
     # Deterministic tie-breaking: priority weight, priority updated timestamp?, ordering_index, id
@@ -24,7 +63,250 @@ def priority_order_query(base_query: Select | None = None) -> Select:
     )
 
 
-async def next_best_tasks(session: AsyncSession, limit: int = 20):
-    query = priority_order_query(select(Task).where(Task.status.in_(["Ready", "In Progress"])))
-    result = await session.execute(query.limit(limit))
+priority_index = PriorityIndex(PRIORITY_WEIGHT)
+_reload_task: Optional[asyncio.Task] = None
+
+
+async def next_best_tasks(session: AsyncSession, limit: int = 20, owner: str | None = None) -> Sequence[Task]:
+    """The ``limit`` best actionable tasks, optionally only ``owner``'s.
+
+    Answered from the worker's priority index when it is loaded and caught
+    up, which leaves Postgres a primary key lookup of the winners instead of
+    an ordered scan. Otherwise, or when winners turn out to be stale,
+    answered by ``query_next_best_tasks``.
+    """
+    if settings.priority_index_enabled and await _sync_priority_index(session):
+        ids = priority_index.top(limit, owner)
+        query = (
+            # One array parameter: the statement text, and so its prepared
+            # plan, stays the same whatever the number of ids
+            select(Task)
+            .where(Task.id == any_(bindparam("ids", ids, type_=ARRAY(UUID(as_uuid=True)))), is_actionable())
+            .options(defer(Task.description))
+        )
+        if owner is not None:
+            query = query.where(Task.owner == owner)
+        result = await session.execute(query)
+        found = {task.id: task for task in result.scalars()}
+        if len(found) == len(ids):
+            metrics.next_best_lookups.inc("index")
+            return [found[task_id] for task_id in ids]
+        # Some winners left the actionable columns or changed owner since the
+        # last catch-up; the index can't say what ranks behind them, SQL can
+    metrics.next_best_lookups.inc("sql")
+    return await query_next_best_tasks(session, limit, owner)
+
+
+async def query_next_best_tasks(session: AsyncSession, limit: int = 20, owner: str | None = None) -> Sequence[Task]:
+    query = select(Task).where(is_actionable()).options(defer(Task.description))
+    if owner is not None:
+        query = query.where(Task.owner == owner)
+    result = await session.execute(priority_order_query(query).limit(limit))
     return result.scalars().all()
+
+
+async def _sync_priority_index(session: AsyncSession) -> bool:
+    """Bring the index up to date with committed task changes; False when it can't answer.
+
+    Catches up at most every ``priority_index_refresh_seconds`` by reading
+    the rows written since its delta sync watermark (and the tombstones of
+    deleted ones), so every write path is seen, whichever worker made it.
+    An index that isn't loaded, or is too far behind to catch up cheaply,
+    is (re)loaded in the background while SQL answers.
+    """
+    index = priority_index
+    if not index.loaded:
+        _schedule_reload()
+        return False
+    if index.syncing or time.monotonic() - index.synced_at < settings.priority_index_refresh_seconds:
+        return True
+
+    index.syncing = True
+    try:
+        result = await session.execute(select(literal_column("pg_snapshot_xmin(pg_current_snapshot())::text::bigint")))
+        watermark = result.scalar_one()
+        result = await session.execute(
+            select(Task.id, Task.status, Task.priority, Task.ordering_index, Task.owner)
+            .where(Task.change_xid >= index.watermark)
+            .limit(settings.priority_index_max_delta + 1)
+        )
+        changed = result.all()
+        if len(changed) > settings.priority_index_max_delta:
+            index.clear()
+            _schedule_reload()
+            return False
+        result = await session.execute(select(TaskTombstone.task_id).where(TaskTombstone.change_xid >= index.watermark))
+        for task_id in result.scalars():
+            index.discard(task_id)
+        for row in changed:
+            if row.status in ACTIONABLE_STATUSES:
+                index.upsert(row.id, row.priority, row.ordering_index, row.owner)
+            else:
+                index.discard(row.id)
+        index.mark_synced(watermark)
+        return True
+    finally:
+        index.syncing = False
+
+
+def _schedule_reload() -> None:
+    global _reload_task
+    if _reload_task is None or _reload_task.done():
+        _reload_task = asyncio.create_task(_reload_priority_index())
+
+
+async def _reload_priority_index() -> None:
+    # Runs outside any request; its statements belong to none of them
+    with uncounted():
+        try:
+            async with AsyncSessionLocal() as session:
+                result = await session.execute(
+                    select(literal_column("pg_snapshot_xmin(pg_current_snapshot())::text::bigint"))
+                )
+                watermark = result.scalar_one()
+                result = await session.execute(
+                    select(Task.id, Task.priority, Task.ordering_index, Task.owner).where(is_actionable())
+                )
+                priority_index.load(result, watermark)
+        except Exception:
+            logger.exception("Could not load the priority index; next-best queries stay on SQL")
+
+
+def _lease_end(lease_seconds: int | None) -> ColumnElement:
+    seconds = min(lease_seconds or settings.queue_lease_seconds, settings.queue_max_lease_seconds)
+    return func.now() + timedelta(seconds=seconds)
+
+
+def _lease_update(*conditions, **values) -> Update:
+    # Leases are bookkeeping, not edits: version, updated_at and change_xid
+    # stay put, so claims and heartbeats don't show up in delta sync.
+    tasks = Task.__table__
+    return (
+        update(tasks)
+        .where(*conditions)
+        .values(**values, updated_at=tasks.c.updated_at, change_xid=tasks.c.change_xid)
+    )
+
+
+async def claim_next_task(session: AsyncSession, *, owner: str, lease_seconds: int | None = None) -> Row | None:
+    """Lease the next best Ready task to ``owner``; None when nothing is claimable.
+
+    A single UPDATE whose target comes from ``SELECT ... FOR UPDATE SKIP
+    LOCKED``: concurrent claimers each lock a different row instead of
+    queueing behind the same one, and a row another claimer leased since
+    our snapshot is re-checked and skipped, so a task is never handed out
+    twice. An expired lease makes the task claimable again; every claim
+    issues a fresh ``lease_token``, which invalidates the previous holder.
+    """
+    tasks = Task.__table__
+    candidate = (
+        priority_order_query(select(Task.id).where(is_claimable()))
+        .limit(1)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    stmt = _lease_update(
+        tasks.c.id == candidate,
+        lease_owner=owner,
+        lease_token=uuid.uuid4(),
+        lease_expires_at=_lease_end(lease_seconds),
+    ).returning(*tasks.c)
+    result = await session.execute(stmt)
+    return result.one_or_none()
+
+
+async def renew_lease(
+    session: AsyncSession, task_id: uuid.UUID, lease_token: uuid.UUID, lease_seconds: int | None = None
+) -> Row:
+    """Heartbeat: push the lease's expiry out again.
+
+    Also revives a lease that lapsed, as long as nobody claimed the task in
+    the meantime (that would have replaced the token).
+    """
+    tasks = Task.__table__
+    stmt = _lease_update(
+        tasks.c.id == task_id, tasks.c.lease_token == lease_token, lease_expires_at=_lease_end(lease_seconds)
+    ).returning(tasks.c.id.label("task_id"), tasks.c.lease_owner, tasks.c.lease_token, tasks.c.lease_expires_at)
+    result = await session.execute(stmt)
+    row = result.one_or_none()
+    if row is None:
+        await _raise_lease_lost(session, task_id)
+    return row
+
+
+async def release_lease(session: AsyncSession, task_id: uuid.UUID, lease_token: uuid.UUID) -> None:
+    """Give a claimed task back to the queue before its lease runs out."""
+    tasks = Task.__table__
+    stmt = _lease_update(
+        tasks.c.id == task_id, tasks.c.lease_token == lease_token,
+        lease_owner=None, lease_token=None, lease_expires_at=None,
+    ).returning(tasks.c.id)
+    result = await session.execute(stmt)
+    if result.one_or_none() is None:
+        await _raise_lease_lost(session, task_id)
+
+
+async def complete_task(
+    session: AsyncSession, task_id: uuid.UUID, lease_token: uuid.UUID, *, status: str, actor: str
+) -> Row:
+    """Finish a claimed task: move it to ``status`` and drop the lease in one UPDATE.
+
+    The lease token stands in for ``if_match``. Unlike a claim this is an
+    edit of the task: the version advances, a task changing column goes to
+    the end of its new one, and a ``moved`` activity is logged.
+    """
+    tasks = Task.__table__
+    # The target column's lock, then the task's row lock: the order every
+    # writer of a column takes them in. The UPDATE comes after both, so its
+    # read of the column tail sees the previous lock holder's write.
+    await ordering_service.lock_column(session, status)
+    result = await session.execute(
+        select(tasks.c.status).where(tasks.c.id == task_id, tasks.c.lease_token == lease_token).with_for_update()
+    )
+    old_status = result.scalar_one_or_none()
+    if old_status is None:
+        await _raise_lease_lost(session, task_id)
+    moved = old_status != status
+    values = {"ordering_index": ordering_service.column_tail(status, tasks.c.id)} if moved else {}
+    stmt = (
+        update(tasks)
+        .where(tasks.c.id == task_id)
+        .values(
+            **values,
+            status=status,
+            lease_owner=None,
+            lease_token=None,
+            lease_expires_at=None,
+            version=tasks.c.version + 1,
+            last_activity_seq=tasks.c.last_activity_seq + int(moved),
+        )
+        .returning(
+            *tasks.c,
+            ordering_service.needs_rebalance(tasks.c.status, tasks.c.ordering_index, tasks.c.id).label("crowded"),
+        )
+    )
+    result = await session.execute(stmt)
+    row = result.one()
+
+    if moved:
+        await activity_service.log_activities(
+            session,
+            [{
+                "task_id": row.id, "actor": actor, "type": "moved",
+                "payload": {"old_status": old_status, "new_status": row.status},
+                "activity_seq": row.last_activity_seq,
+            }],
+        )
+    if row.crowded:
+        with uncounted():
+            await ordering_service.rebalance_column(session, row.status)
+            result = await session.execute(select(*tasks.c).where(tasks.c.id == task_id))
+            row = result.one()
+    return row
+
+
+async def _raise_lease_lost(session: AsyncSession, task_id: uuid.UUID) -> None:
+    result = await session.execute(select(Task.id).where(Task.id == task_id))
+    if result.scalar_one_or_none() is None:
+        raise TaskNotFoundError("Task not found")
+    raise LeaseLostError("lease no longer held")
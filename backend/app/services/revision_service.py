@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import logging
+
+from sqlalchemy import Sequence, select, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.db import after_commit
+
+logger = logging.getLogger(__name__)
+
+# Board-wide change counter; its value is the ETag of every board read
+board_revision_seq = Sequence("board_revision_seq")
+
+
+async def current_revision(session: AsyncSession) -> int:
+    # last_value is read straight off the sequence: no table is touched
+    result = await session.execute(text("SELECT last_value FROM board_revision_seq"))
+    return result.scalar_one()
+
+
+def mark_changed(session: AsyncSession) -> None:
+    """Advance the board revision once the session's transaction commits.
+
+    The bump has to follow the COMMIT: a reader that saw the new revision
+    before the data became visible would cache stale rows under it. Readers
+    take the revision *before* querying, so the worst case is one extra
+    full response, never a stale 304.
+    """
+    after_commit(session, _bump)
+
+
+async def _bump(session: AsyncSession) -> None:
+    try:
+        await session.execute(select(board_revision_seq.next_value()))
+    except SQLAlchemyError:
+        # The write itself is committed; failing the request now would only
+        # make the client retry it.
+        logger.exception("Could not advance the board revision")
@@ -1,20 +1,42 @@
 from __future__ import annotations
 
 import uuid
-from typing import Sequence
+from typing import Any, Sequence, get_args
 
-from sqlalchemy import func, select, update
+from sqlalchemy import (
+    Integer, Row, String, and_, case, cast, column, delete, exists, false, func, literal_column, or_, select,
+    text, true, tuple_, update, values,
+)
+from sqlalchemy.dialects.postgresql import UUID, insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased, defer
 
-from app.models.task import Task
-from app.schemas.task import TaskCreate, TaskUpdate
+from app.core import metrics
+from app.core.query_count import uncounted
+from app.models.task import CURRENT_XID_SQL, Task
+from app.models.user import User
+from app.models.tombstone import TaskTombstone
+from app.schemas.task import BulkUpdateRequest, Status, TaskCreate, TaskUpdate
+from app.services import activity_service, ordering_service
+
+# Board columns in display order
+COLUMNS: tuple[str, ...] = get_args(Status)
 
 
 class VersionConflictError(Exception):
     pass
 
 
+class TaskNotFoundError(Exception):
+    pass
+
+
+def _version_conflict(operation: str) -> VersionConflictError:
+    metrics.version_conflicts.inc(operation)
+    return VersionConflictError("stale version")
+
+
 async def list_tasks(session: AsyncSession, sort: str = "manual") -> Sequence[Task]:
     query = select(Task)
     if sort == "priority":
@@ -28,6 +50,96 @@ async def list_tasks(session: AsyncSession, sort: str = "manual") -> Sequence[Ta
     return result.scalars().all()
 
 
+async def list_board_window(
+    session: AsyncSession, per_column: int, *, exact_totals: bool = False
+) -> tuple[dict[str, list[Task]], dict[str, int], set[str]]:
+    """First ``per_column`` cards of every status column plus per-column totals.
+
+    Each column is an independent index range scan (LATERAL ... LIMIT), so the
+    cost depends on the window size rather than on the size of the board.
+    Exact totals would mean counting every card, so by default a column
+    that fills its window gets the planner's estimate instead; the third
+    value names those columns. Shorter columns are counted by the window
+    itself.
+    """
+    statuses = values(column("status", String), name="columns").data([(c,) for c in COLUMNS])
+    window = (
+        select(Task)
+        .where(Task.status == statuses.c.status)
+        .order_by(Task.ordering_index, Task.id)
+        .limit(per_column)
+        .lateral("window")
+    )
+    card = aliased(Task, window)
+    result = await session.execute(
+        select(card)
+        .select_from(statuses)
+        .join(window, true())
+        .options(defer(card.description))
+        .order_by(card.ordering_index, card.id)
+    )
+    columns: dict[str, list[Task]] = {c: [] for c in COLUMNS}
+    for task in result.scalars():
+        columns[task.status].append(task)
+
+    estimates = None if exact_totals else await estimate_column_totals(session)
+    if estimates is None:
+        counts = await session.execute(select(Task.status, func.count()).group_by(Task.status))
+        totals = dict.fromkeys(COLUMNS, 0)
+        totals.update({status: total for status, total in counts.all()})
+        return columns, totals, set()
+    totals, estimated = {}, set()
+    for status, tasks in columns.items():
+        if len(tasks) < per_column:
+            totals[status] = len(tasks)
+        else:
+            totals[status] = max(estimates.get(status, 0), len(tasks))
+            estimated.add(status)
+    return columns, totals, estimated
+
+
+async def estimate_column_totals(session: AsyncSession) -> dict[str, int] | None:
+    """Cards per status from the planner's statistics, without touching ``tasks``.
+
+    Status has few enough values for all of them to be in the column's
+    most-common-values list. Like the planner, the row count is the last
+    ANALYZE's rows per page times the table's current size, so growth since
+    then shows; the split between columns is as of that ANALYZE. None
+    before the table was first analyzed.
+    """
+    result = await session.execute(
+        text(
+            "SELECT s.most_common_vals::text::text[] AS statuses, s.most_common_freqs AS frequencies, "
+            "c.reltuples / NULLIF(c.relpages, 0) * (pg_relation_size(c.oid) / current_setting('block_size')::int) "
+            "AS rows FROM pg_stats s JOIN pg_class c ON c.oid = 'tasks'::regclass "
+            "WHERE s.schemaname = current_schema() AND s.tablename = 'tasks' AND s.attname = 'status'"
+        )
+    )
+    row = result.one_or_none()
+    if row is None or row.rows is None or row.rows < 0 or row.statuses is None:
+        return None
+    return {status: round(frequency * row.rows) for status, frequency in zip(row.statuses, row.frequencies)}
+
+
+async def list_column_tasks(
+    session: AsyncSession,
+    status: str,
+    *,
+    limit: int,
+    after_index: float | None = None,
+    after_id: uuid.UUID | None = None,
+) -> Sequence[Task]:
+    """Next page of one column, continuing after (after_index, after_id)."""
+    query = select(Task).options(defer(Task.description)).where(Task.status == status)
+    if after_index is not None:
+        if after_id is not None:
+            query = query.where(tuple_(Task.ordering_index, Task.id) > tuple_(after_index, after_id))
+        else:
+            query = query.where(Task.ordering_index > after_index)
+    result = await session.execute(query.order_by(Task.ordering_index, Task.id).limit(limit))
+    return result.scalars().all()
+
+
 async def create_task(session: AsyncSession, payload: TaskCreate) -> Task:
     # Auto-assign ordering_index at end of column if not explicitly set or is default
     if payload.ordering_index == 0.0:
@@ -38,7 +150,7 @@ async def create_task(session: AsyncSession, payload: TaskCreate) -> Task:
         )
         max_index = result.scalar_one()
         payload_dict = payload.model_dump()
-        payload_dict["ordering_index"] = max_index + 1000.0
+        payload_dict["ordering_index"] = max_index + ordering_service.ORDERING_STEP
     else:
         payload_dict = payload.model_dump()
     task = Task(**payload_dict)
@@ -47,24 +159,83 @@ async def create_task(session: AsyncSession, payload: TaskCreate) -> Task:
     return task
 
 
-async def update_task(session: AsyncSession, task_id: uuid.UUID, payload: TaskUpdate) -> Task:
-    result = await session.execute(select(Task).where(Task.id == task_id))
-    task = result.scalar_one()
+async def update_task(session: AsyncSession, task_id: uuid.UUID, payload: TaskUpdate, *, actor: str) -> Row:
+    """Apply a PATCH as one compare-and-swap UPDATE ... RETURNING.
 
-    if payload.if_match != task.version:
-        raise VersionConflictError("stale version")
+    The version check, the owner check, the write, the activity sequence
+    bump and the read-back of both old and new values are a single
+    statement; only a rejected write costs one more lookup to tell the
+    caller why. Logs the ``updated`` activity, or folds it into the actor's
+    own one from moments ago (``activity_coalesce_seconds``), and returns
+    the new row.
+    """
+    tasks = Task.__table__
+    old = tasks.alias("old")
+    fields = payload.model_dump(exclude_unset=True, exclude={"if_match"})
+    conditions = [tasks.c.id == task_id, tasks.c.version == payload.if_match, old.c.id == tasks.c.id]
+    owner = fields.get("owner")
+    if owner is not None:
+        conditions.append(exists().where(User.username == owner))
+    # Same rule as the activity payload below: status/priority count when
+    # they differ, the other fields whenever they are given.
+    recorded = payload.model_dump(exclude_none=True, exclude={"if_match", "tags", "ordering_index"})
+    changed = or_(
+        false(),
+        *(
+            old.c[name].is_distinct_from(value) if name in ("status", "priority") else true()
+            for name, value in recorded.items()
+        ),
+    )
+    # An edit right after the same actor's previous one is merged into that
+    # activity row, which keeps its sequence number, instead of adding a row
+    previous = activity_service.coalescible_payload(old, actor)
+    extra = []
+    if previous is not None:
+        changed = and_(changed, previous.is_(None))
+        extra.append(previous.label("coalesce_into"))
+    row = await _compare_and_swap(session, conditions, fields, changed, old, *extra)
+    if row is None:
+        await _raise_rejected(session, task_id, payload.if_match, "update")
+        if owner is None:
+            # Without an owner check only id and version can have failed,
+            # and both held on re-read: the row changed under the write
+            raise _version_conflict("update")
+        raise ValueError(f"User '{owner}' not found")
 
-    for field, value in payload.model_dump(exclude_unset=True, exclude={"if_match"}).items():
-        if field == "owner" and value is not None:
-             # Validate user exists
-             from app.services import user_service
-             user = await user_service.get_user_by_username(session, value)
-             if not user:
-                 raise ValueError(f"User '{value}' not found")
-        setattr(task, field, value)
-    task.bump_version()
-    await session.flush()
-    return task
+    activity_payload: dict[str, Any] = {}
+    if "status" in recorded and recorded["status"] != row.old_status:
+        activity_payload["old_status"] = row.old_status
+        activity_payload["new_status"] = recorded["status"]
+    if "priority" in recorded and recorded["priority"] != row.old_priority:
+        activity_payload["old_priority"] = row.old_priority
+        activity_payload["new_priority"] = recorded["priority"]
+    if "owner" in recorded:
+        activity_payload["old_owner"] = row.old_owner
+        activity_payload["new_owner"] = recorded["owner"]
+    if "title" in recorded:
+        activity_payload["title"] = recorded["title"]
+    if "description" in recorded:
+        activity_payload["description"] = True
+    if "estimate" in recorded:
+        activity_payload["estimate"] = recorded["estimate"]
+    coalesce_into = row._mapping.get("coalesce_into")
+    if activity_payload and coalesce_into is not None:
+        await activity_service.coalesce_activity(
+            session,
+            task_id=row.id,
+            activity_seq=row.last_activity_seq,
+            type="updated",
+            payload=activity_service.merge_updated_payloads(coalesce_into, activity_payload),
+        )
+    elif activity_payload:
+        await activity_service.log_activities(
+            session,
+            [{
+                "task_id": row.id, "actor": actor, "type": "updated",
+                "payload": activity_payload, "activity_seq": row.last_activity_seq,
+            }],
+        )
+    return row
 
 
 async def reorder_task(
@@ -74,15 +245,318 @@ async def reorder_task(
     new_status: str | None,
     new_ordering_index: float,
     if_match: int,
-) -> Task:
-    result = await session.execute(select(Task).where(Task.id == task_id))
-    task = result.scalar_one()
-    if if_match != task.version:
-        raise VersionConflictError("stale version")
+    actor: str,
+) -> Row:
+    """Place a task at a client-computed index with one compare-and-swap UPDATE.
 
+    Logs a ``moved`` activity when the status changes. The same statement
+    reports whether the new index landed on top of a neighbour, in which
+    case the column is renumbered. That needs the column lock, which is
+    taken up front: the compare-and-swap holds the task's row lock.
+    """
+    tasks = Task.__table__
+    old = tasks.alias("old")
+    target = new_status if new_status is not None else tasks.c.status
+    result = await session.execute(
+        select(tasks.c.status, ordering_service.column_lock(target)).where(tasks.c.id == task_id)
+    )
+    seen_status = result.scalar_one_or_none()
+    fields: dict[str, Any] = {"ordering_index": new_ordering_index}
     if new_status is not None:
-        task.status = new_status  # type: ignore[arg-type]
-    task.ordering_index = new_ordering_index
+        fields["status"] = new_status
+    conditions = [tasks.c.id == task_id, tasks.c.version == if_match, old.c.id == tasks.c.id]
+    if new_status is None:
+        # Still in the column whose lock is held
+        conditions.append(tasks.c.status == seen_status)
+    changed = old.c.status.is_distinct_from(new_status) if new_status is not None else false()
+    # Client-side bisection eventually runs out of room; RETURNING sees the
+    # written row, so this checks the task's new column and index.
+    crowded = ordering_service.needs_rebalance(tasks.c.status, new_ordering_index, tasks.c.id).label("crowded")
+    row = await _compare_and_swap(session, conditions, fields, changed, old, crowded)
+    if row is None:
+        await _raise_rejected(session, task_id, if_match, "reorder")
+        raise _version_conflict("reorder")
+
+    if row.status != row.old_status:
+        await activity_service.log_activities(
+            session,
+            [{
+                "task_id": row.id, "actor": actor, "type": "moved",
+                "payload": {"old_status": row.old_status, "new_status": row.status},
+                "activity_seq": row.last_activity_seq,
+            }],
+        )
+    if row.crowded:
+        with uncounted():
+            await ordering_service.rebalance_column(session, row.status)
+            result = await session.execute(select(*tasks.c).where(tasks.c.id == task_id))
+            row = result.one()
+    return row
+
+
+async def _compare_and_swap(session: AsyncSession, conditions, fields: dict[str, Any], changed, old, *extra) -> Row | None:
+    """UPDATE ... WHERE <conditions> RETURNING the new row plus its old status/priority/owner.
+
+    ``old`` is a self-join alias of ``tasks``, which in an UPDATE's FROM list
+    still sees the row as it was before the statement. ``changed`` decides
+    whether an activity will be logged, and so whether ``last_activity_seq``
+    advances; the version always does. None when nothing matched.
+    """
+    tasks = Task.__table__
+    step = case((changed, 1), else_=0)
+    stmt = (
+        update(tasks)
+        .where(*conditions)
+        .values(**fields, version=tasks.c.version + 1, last_activity_seq=tasks.c.last_activity_seq + step)
+        .returning(
+            *tasks.c,
+            old.c.status.label("old_status"),
+            old.c.priority.label("old_priority"),
+            old.c.owner.label("old_owner"),
+            *extra,
+        )
+    )
+    result = await session.execute(stmt)
+    return result.one_or_none()
+
+
+async def _raise_rejected(session: AsyncSession, task_id: uuid.UUID, if_match: int, operation: str) -> None:
+    """Explain a compare-and-swap that matched nothing.
+
+    Raises TaskNotFoundError or VersionConflictError; returns when the task
+    exists at the expected version, i.e. another condition rejected the write.
+    """
+    result = await session.execute(select(Task.version).where(Task.id == task_id))
+    version = result.scalar_one_or_none()
+    if version is None:
+        raise TaskNotFoundError("Task not found")
+    if version != if_match:
+        raise _version_conflict(operation)
+
+
+async def move_task(
+    session: AsyncSession,
+    task_id: uuid.UUID,
+    *,
+    new_status: str | None,
+    after_id: uuid.UUID | None,
+    before_id: uuid.UUID | None,
+    if_match: int,
+) -> tuple[Task, str]:
+    """Drop a task between two neighbours; the server picks the index.
+
+    Returns the task and the status it had before the move.
+    """
+    # The target column's lock comes before any row lock; without a new
+    # status that is the column the task is in now
+    target = new_status if new_status is not None else Task.status
+    result = await session.execute(
+        select(Task.status, ordering_service.column_lock(target)).where(Task.id == task_id)
+    )
+    seen_status = result.scalar_one_or_none()
+    if seen_status is None:
+        raise TaskNotFoundError("Task not found")
+    result = await session.execute(
+        select(Task).where(Task.id == task_id).with_for_update().execution_options(populate_existing=True)
+    )
+    task = result.scalar_one_or_none()
+    if task is None:
+        raise TaskNotFoundError("Task not found")
+    if if_match != task.version:
+        raise _version_conflict("move")
+
+    old_status = task.status
+    status = new_status or old_status
+    if new_status is None and old_status != seen_status:
+        # Changed column between the two reads: the lock held is the wrong one
+        raise _version_conflict("move")
+    neighbour_ids = [i for i in (after_id, before_id) if i is not None]
+    if task_id in neighbour_ids:
+        raise ValueError("A task cannot be its own neighbour")
+    neighbours: dict[uuid.UUID, Task] = {}
+    if neighbour_ids:
+        result = await session.execute(
+            select(Task)
+            .where(Task.id.in_(neighbour_ids))
+            .order_by(Task.id)
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
+        neighbours = {n.id: n for n in result.scalars()}
+    for neighbour_id in neighbour_ids:
+        neighbour = neighbours.get(neighbour_id)
+        if neighbour is None or neighbour.status != status:
+            raise ValueError(f"Neighbour {neighbour_id} is not in column '{status}'")
+    after = neighbours.get(after_id) if after_id else None
+    before = neighbours.get(before_id) if before_id else None
+    if after is not None and before is not None and (
+        (after.ordering_index, after.id) >= (before.ordering_index, before.id)
+    ):
+        raise ValueError("after_id must come before before_id in the column")
+
+    task.ordering_index = await ordering_service.position_between(
+        session, status, task.id, after=after, before=before
+    )
+    task.status = status
     task.bump_version()
     await session.flush()
-    return task
+    return task, old_status
+
+
+async def record_tombstones(session: AsyncSession, task_ids: list[uuid.UUID]) -> None:
+    """Remember hard-deleted task ids for delta sync.
+
+    An id can be deleted again after an import restored it, in which case
+    its old tombstone is moved up to this deletion.
+    """
+    if task_ids:
+        stmt = insert(TaskTombstone).values([{"task_id": task_id} for task_id in task_ids])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[TaskTombstone.task_id],
+            set_={"change_xid": literal_column(CURRENT_XID_SQL), "deleted_at": func.now()},
+        )
+        await session.execute(stmt)
+
+
+async def list_changes(
+    session: AsyncSession, since: int | None
+) -> tuple[int, Sequence[Task], list[uuid.UUID]]:
+    """Tasks written and ids deleted at or after watermark ``since``.
+
+    The watermark is the xmin of a snapshot taken *before* the reads: every
+    transaction below it has finished, so any later write carries a
+    change_xid at or above it and shows up in the next call. Rows written by
+    transactions still open at that point may be sent twice, which clients
+    treat as an idempotent upsert. Without ``since`` the whole board is
+    returned and there are no tombstones to report.
+    """
+    result = await session.execute(select(literal_column("pg_snapshot_xmin(pg_current_snapshot())::text::bigint")))
+    watermark = result.scalar_one()
+
+    query = select(Task).order_by(Task.change_xid, Task.id)
+    deleted: list[uuid.UUID] = []
+    if since is not None:
+        query = query.where(Task.change_xid >= since)
+        result = await session.execute(
+            select(TaskTombstone.task_id).where(TaskTombstone.change_xid >= since).order_by(TaskTombstone.change_xid)
+        )
+        deleted = list(result.scalars())
+    result = await session.execute(query)
+    return watermark, result.scalars().all(), deleted
+
+
+BULK_CONFLICT_ERROR = "Conflict: Task has been modified by someone else"
+BULK_NOT_FOUND_ERROR = "Not found"
+
+
+async def bulk_update_tasks(
+    session: AsyncSession, body: BulkUpdateRequest, *, actor: str
+) -> tuple[list[Row], list[dict[str, Any]]]:
+    """Apply one bulk status/priority/owner change (or delete) set-wise.
+
+    Every requested id is joined against a VALUES list carrying its expected
+    version, so the version check, the write and the read-back happen in a
+    single statement regardless of batch size. Ids missing from the RETURNING
+    set are classified as conflicts or not-found with one extra lookup.
+    Returned rows carry every ``tasks`` column, ready for ``TaskRead``.
+    """
+    tasks = Task.__table__
+    task_ids = list(dict.fromkeys(body.task_ids))
+    expected = values(
+        column("id", UUID(as_uuid=True)), column("version", Integer), name="expected"
+    ).data([(task_id, body.versions.get(task_id)) for task_id in task_ids])
+    # An all-NULL VALUES column is typed as text, hence the cast.
+    expected_version = cast(expected.c.version, Integer)
+    matches = (tasks.c.id == expected.c.id) & (
+        expected_version.is_(None) | (tasks.c.version == expected_version)
+    )
+
+    if body.delete:
+        # No "deleted" activity here: activities cascade with their task, so
+        # the row would be removed by this same statement.
+        result = await session.execute(delete(tasks).where(matches).returning(*tasks.c))
+        done = {row.id: row for row in result.all()}
+        await record_tombstones(session, list(done))
+    else:
+        done = await _bulk_apply_fields(session, body, matches, actor=actor)
+
+    failed: list[dict[str, Any]] = []
+    missing = [task_id for task_id in task_ids if task_id not in done]
+    if missing:
+        result = await session.execute(select(Task.id).where(Task.id.in_(missing)))
+        existing = set(result.scalars())
+        failed = [
+            {"task_id": task_id, "error": BULK_CONFLICT_ERROR if task_id in existing else BULK_NOT_FOUND_ERROR}
+            for task_id in missing
+        ]
+        conflicts = sum(item["error"] == BULK_CONFLICT_ERROR for item in failed)
+        if conflicts:
+            metrics.version_conflicts.inc("bulk", amount=conflicts)
+    return [done[task_id] for task_id in task_ids if task_id in done], failed
+
+
+async def _bulk_apply_fields(
+    session: AsyncSession, body: BulkUpdateRequest, matches, *, actor: str
+) -> dict[uuid.UUID, Row]:
+    tasks = Task.__table__
+    # Self-join: "old" sees the row as it was before this UPDATE, which gives
+    # the activity diff without a separate SELECT.
+    old = tasks.alias("old")
+    fields = {
+        name: value
+        for name, value in (("status", body.status), ("priority", body.priority), ("owner", body.owner))
+        if value is not None
+    }
+    # Owner assignments are always recorded; status/priority only when they differ.
+    changed = or_(
+        false(),
+        *(true() if name == "owner" else old.c[name].is_distinct_from(value) for name, value in fields.items()),
+    )
+    step = case((changed, 1), else_=0)
+    stmt = (
+        update(tasks)
+        .where(matches, old.c.id == tasks.c.id)
+        .values(
+            **fields,
+            version=tasks.c.version + step,
+            last_activity_seq=tasks.c.last_activity_seq + step,
+            updated_at=case((changed, func.now()), else_=tasks.c.updated_at),
+            change_xid=case((changed, literal_column(CURRENT_XID_SQL)), else_=tasks.c.change_xid),
+        )
+        .returning(
+            *tasks.c,
+            old.c.version.label("old_version"),
+            old.c.status.label("old_status"),
+            old.c.priority.label("old_priority"),
+            old.c.owner.label("old_owner"),
+        )
+    )
+    result = await session.execute(stmt)
+
+    done: dict[uuid.UUID, Row] = {}
+    activities: list[dict[str, Any]] = []
+    for row in result.all():
+        done[row.id] = row
+        if row.version == row.old_version:
+            continue
+        payload: dict[str, Any] = {}
+        if body.status is not None and body.status != row.old_status:
+            payload["old_status"] = row.old_status
+            payload["new_status"] = body.status
+        if body.priority is not None and body.priority != row.old_priority:
+            payload["old_priority"] = row.old_priority
+            payload["new_priority"] = body.priority
+        if body.owner is not None:
+            payload["old_owner"] = row.old_owner
+            payload["new_owner"] = body.owner
+        activities.append(
+            {
+                "task_id": row.id,
+                "actor": actor,
+                "type": "bulk_updated",
+                "payload": payload,
+                "activity_seq": row.last_activity_seq,
+            }
+        )
+    await activity_service.log_activities(session, activities)
+    return done
@@ -8,7 +8,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.user import User
 from app.schemas.user import UserCreate
-from app.core.security import get_password_hash, verify_password
+from app.core.auth_cache import principal_cache
+from app.core.security import get_password_hash_async, verify_password_async
 
 
 async def get_user_by_email(session: AsyncSession, email: str) -> Optional[User]:
@@ -27,7 +28,7 @@ async def get_user_by_id(session: AsyncSession, user_id: uuid.UUID) -> Optional[
 
 
 async def create_user(session: AsyncSession, user_data: UserCreate) -> User:
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await get_password_hash_async(user_data.password)
     user = User(
         email=user_data.email,
         username=user_data.username,
@@ -39,15 +40,23 @@ async def create_user(session: AsyncSession, user_data: UserCreate) -> User:
     return user
 
 
-async def authenticate_user(session: AsyncSession, username_or_email: str, password: str) -> Optional[User]:
+async def get_user_by_login(session: AsyncSession, username_or_email: str) -> Optional[User]:
     # Try to find user by username first, then by email
     user = await get_user_by_username(session, username_or_email)
     if not user:
         user = await get_user_by_email(session, username_or_email)
-    
+    return user
+
+
+async def authenticate_user(user: Optional[User], password: str) -> Optional[User]:
+    """``user`` if ``password`` is theirs.
+
+    Takes no session: bcrypt takes ~100ms, so callers look the user up with
+    ``get_user_by_login`` and release their connection first.
+    """
     if not user:
         return None
-    if not verify_password(password, user.hashed_password):
+    if not await verify_password_async(password, user.hashed_password):
         return None
     return user
 
@@ -55,3 +64,11 @@ async def authenticate_user(session: AsyncSession, username_or_email: str, passw
 async def get_users(session: AsyncSession) -> list[User]:
     result = await session.execute(select(User))
     return result.scalars().all()
+
+
+async def deactivate_user(session: AsyncSession, user: User) -> User:
+    user.is_active = False
+    await session.flush()
+    # Drop cached principals so the user's open tokens stop working right away
+    principal_cache.invalidate_user(user.id)
+    return user
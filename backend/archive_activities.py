@@ -0,0 +1,53 @@
+import argparse
+import asyncio
+import logging
+import sys
+import os
+from datetime import datetime, timezone
+
+# Ensure the backend directory is in the python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.config import get_settings
+from app.core.db import AsyncSessionLocal
+from app.services import partition_service
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def main():
+    """Activities retention: archive partitions past the retention window, create upcoming ones.
+
+    Meant to run daily (cron, a scheduled job); every step is idempotent.
+    """
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument(
+        "--keep-months", type=int, default=settings.activity_retention_months,
+        help="months of history to keep besides the current one (default: ACTIVITY_RETENTION_MONTHS)",
+    )
+    parser.add_argument(
+        "--archive-dir", default=settings.activity_archive_dir,
+        help="where <partition>.ndjson.zst files are written (default: ACTIVITY_ARCHIVE_DIR)",
+    )
+    parser.add_argument("--dry-run", action="store_true", help="list partitions and what would be archived")
+    args = parser.parse_args()
+
+    async with AsyncSessionLocal() as session:
+        if args.dry_run:
+            cutoff = partition_service.add_months(partition_service.month_of(datetime.now(timezone.utc)), -args.keep_months)
+            for partition in await partition_service.list_partitions(session):
+                action = "archive" if partition.month < cutoff else "keep"
+                state = "" if partition.attached else " (detached)"
+                logger.info(f"{partition.name}: ~{max(partition.rows, 0)} rows{state} -> {action}")
+            return
+        created = await partition_service.ensure_upcoming_partitions(session)
+    if created:
+        logger.info(f"Created partitions {', '.join(created)}")
+
+    archived = await partition_service.archive_old_partitions(args.keep_months, args.archive_dir)
+    logger.info(f"Archived {len(archived)} partitions, {sum(a.rows for a in archived)} activities")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,85 @@
+"""Latency of unrelated board reads while a login wave is hashing passwords.
+
+Probes ``GET /api/tasks/`` at a fixed interval, first on an idle server and
+then while ``--logins`` concurrent clients log in back to back, and prints
+p50/p95/p99 for both phases. ``--inline-hashing`` runs bcrypt on the event
+loop, as the service did before hashing moved to the executor, for comparison.
+
+Needs a migrated, seeded database (``python seed.py``):
+
+    python -m benchmarks.auth_throughput --logins 16 --duration 10
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+
+from benchmarks.common import asgi_client, login, summarize
+
+
+async def _probe(client, stop: asyncio.Event, interval: float) -> list[float]:
+    samples: list[float] = []
+    while not stop.is_set():
+        started = time.perf_counter()
+        response = await client.get("/api/tasks/")
+        response.raise_for_status()
+        samples.append(time.perf_counter() - started)
+        await asyncio.sleep(interval)
+    return samples
+
+
+async def _login_loop(client, stop: asyncio.Event, username: str, password: str) -> int:
+    count = 0
+    while not stop.is_set():
+        await login(client, username, password)
+        count += 1
+    return count
+
+
+async def _phase(duration: float, logins: int, interval: float, username: str, password: str) -> dict:
+    stop = asyncio.Event()
+    async with asgi_client() as probe_client:
+        probe = asyncio.create_task(_probe(probe_client, stop, interval))
+        clients = [asgi_client() for _ in range(logins)]
+        loops = [asyncio.create_task(_login_loop(c, stop, username, password)) for c in clients]
+        await asyncio.sleep(duration)
+        stop.set()
+        samples = await probe
+        completed = sum(await asyncio.gather(*loops))
+        for c in clients:
+            await c.aclose()
+    return {"probe": summarize(samples), "logins_per_second": round(completed / duration, 2)}
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=16, help="concurrent clients logging in")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per phase")
+    parser.add_argument("--interval", type=float, default=0.01, help="pause between probe requests")
+    parser.add_argument("--username", default="admin")
+    parser.add_argument("--password", default="password")
+    parser.add_argument("--inline-hashing", action="store_true", help="verify bcrypt on the event loop")
+    args = parser.parse_args()
+
+    if args.inline_hashing:
+        from app.core import security
+        from app.services import user_service
+
+        async def verify_inline(plain: str, hashed: str) -> bool:
+            return security.verify_password(plain, hashed)
+
+        user_service.verify_password_async = verify_inline
+
+    results = {
+        "idle": await _phase(args.duration, 0, args.interval, args.username, args.password),
+        "during_logins": await _phase(args.duration, args.logins, args.interval, args.username, args.password),
+        "logins": args.logins,
+        "hashing": "inline" if args.inline_hashing else "executor",
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
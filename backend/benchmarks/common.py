@@ -0,0 +1,44 @@
+"""Shared helpers for the benchmark scripts.
+
+Benchmarks drive ``app.main:app`` in-process over an ASGI transport, against
+whatever database ``DATABASE_URL`` points at. Run them from ``backend/``:
+
+    python -m benchmarks.<name> --help
+"""
+from __future__ import annotations
+
+import math
+from typing import Sequence
+
+import httpx
+
+
+def percentile(samples: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile; ``pct`` in [0, 100]."""
+    if not samples:
+        return float("nan")
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(samples: Sequence[float]) -> dict[str, float]:
+    """p50/p95/p99/max in milliseconds for a list of durations in seconds."""
+    return {
+        "count": len(samples),
+        "p50_ms": round(percentile(samples, 50) * 1000, 3),
+        "p95_ms": round(percentile(samples, 95) * 1000, 3),
+        "p99_ms": round(percentile(samples, 99) * 1000, 3),
+        "max_ms": round(max(samples) * 1000, 3) if samples else float("nan"),
+    }
+
+
+def asgi_client() -> httpx.AsyncClient:
+    from app.main import app
+
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench")
+
+
+async def login(client: httpx.AsyncClient, username: str, password: str) -> None:
+    response = await client.post("/api/auth/login", json={"username": username, "password": password})
+    response.raise_for_status()
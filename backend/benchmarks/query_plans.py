@@ -0,0 +1,228 @@
+"""Fail if a hot query falls back to a sequential scan.
+
+Runs the service calls behind the board's hot paths against the database in
+``DATABASE_URL``, captures every statement they send, and EXPLAINs each one
+with the same parameters. Any ``Seq Scan`` on ``tasks``, ``activities`` or
+``comments`` fails the check (exit status 1). Writes happen inside one
+transaction that is rolled back at the end.
+
+Plans only mean something on a realistically sized, analyzed table; on a
+few hundred rows a sequential scan is the right call. Load data first:
+
+    python generate_data.py --tasks-per-status 100000 --activities-per-task 4 --comments-per-task 1
+    python -m benchmarks.query_plans
+
+Unbounded reads (``GET /tasks/`` without a limit, ``/tasks/changes``
+without ``since``) are deliberately not checked: reading the whole table
+is exactly what a sequential scan is for. Known whole-table statements
+inside a checked path are listed in ``KNOWN_SEQ_SCANS`` with the reason, and
+reported without failing.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import uuid
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Iterator
+
+from sqlalchemy import event, func, literal_column, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.db import AsyncSessionLocal, engine
+from app.models.activity import Activity
+from app.models.comment import Comment
+from app.models.task import Task
+from app.schemas.task import TaskCreate, TaskUpdate
+from app.services import activity_service, queue_service, task_service
+
+LARGE_TABLES = {"tasks", "activities", "comments"}
+# Partitions this small (empty months ahead, the default partition) are
+# scanned sequentially by design
+SMALL_PARTITION_ROWS = 10_000
+# Statement prefix -> why scanning the table is expected
+KNOWN_SEQ_SCANS: dict[str, str] = {}
+
+
+@dataclass
+class Sample:
+    """Existing rows the checks aim their queries at."""
+
+    task_id: uuid.UUID
+    version: int
+    ordering_index: float
+    watermark: int
+    activity_key: tuple[datetime, uuid.UUID]
+    task_activity_key: tuple[int, datetime]
+
+    @classmethod
+    async def load(cls, session: AsyncSession) -> "Sample":
+        # A task with some history, so per-task lookups have rows to find
+        result = await session.execute(select(Comment.task_id).limit(1))
+        task_id = result.scalar_one()
+        task = await session.get(Task, task_id)
+        result = await session.execute(select(literal_column("pg_snapshot_xmin(pg_current_snapshot())::text::bigint")))
+        watermark = result.scalar_one()
+        # A feed cursor a few months back, where partition pruning matters
+        result = await session.execute(
+            select(Activity.created_at, Activity.id)
+            .where(Activity.created_at < func.now() - timedelta(days=90))
+            .order_by(Activity.created_at.desc(), Activity.id.desc())
+            .limit(1)
+        )
+        activity_key = tuple(result.one())
+        # The task's newest activity, as a per-task feed cursor
+        result = await session.execute(
+            select(Activity.activity_seq, Activity.created_at)
+            .where(Activity.task_id == task_id)
+            .order_by(Activity.activity_seq.desc())
+            .limit(1)
+        )
+        task_activity_key = tuple(result.one())
+        return cls(task_id, task.version, task.ordering_index, watermark, activity_key, task_activity_key)
+
+
+@dataclass
+class Check:
+    name: str
+    run: Callable[[AsyncSession, Sample], Awaitable[Any]]
+
+
+async def _comments_thread(session: AsyncSession, sample: Sample):
+    # Same query as GET /comments/task/{id}
+    await session.execute(select(Comment).where(Comment.task_id == sample.task_id).order_by(Comment.created_at.desc()))
+
+
+async def _cascade_lookups(session: AsyncSession, sample: Sample):
+    # What ON DELETE CASCADE looks up in each child table when a task goes
+    await session.execute(select(Comment.id).where(Comment.task_id == sample.task_id))
+    await session.execute(select(Activity.id).where(Activity.task_id == sample.task_id))
+
+
+CHECKS = [
+    Check("board window", lambda s, x: task_service.list_board_window(s, per_column=50)),
+    Check(
+        "column page (keyset)",
+        lambda s, x: task_service.list_column_tasks(s, "Ready", limit=50, after_index=x.ordering_index, after_id=x.task_id),
+    ),
+    Check("create task (column tail)", lambda s, x: task_service.create_task(s, TaskCreate(title="plan check", status="Ready"))),
+    Check(
+        "update task (compare-and-swap)",
+        lambda s, x: task_service.update_task(s, x.task_id, TaskUpdate(priority="P1", if_match=x.version), actor="admin"),
+    ),
+    Check("delta sync since watermark", lambda s, x: task_service.list_changes(s, x.watermark)),
+    Check("task activity history", lambda s, x: activity_service.list_task_activities(s, x.task_id, limit=50)),
+    Check(
+        "task activity page (cursor)",
+        lambda s, x: activity_service.list_task_activities(s, x.task_id, limit=50, before=x.task_activity_key),
+    ),
+    Check("activity feed", lambda s, x: activity_service.list_activities(s, limit=100)),
+    Check("activity feed by type", lambda s, x: activity_service.list_activities(s, limit=100, type="moved")),
+    Check("activity feed page (cursor)", lambda s, x: activity_service.list_activities(s, limit=100, after=x.activity_key)),
+    Check("comment thread", _comments_thread),
+    Check("delete cascade lookups", _cascade_lookups),
+    Check("work queue", lambda s, x: queue_service.query_next_best_tasks(s, limit=20)),
+    Check("work queue claim", lambda s, x: queue_service.claim_next_task(s, owner="plan-check")),
+]
+
+
+def _nodes(plan: dict) -> Iterator[dict]:
+    yield plan
+    for child in plan.get("Plans", ()):
+        yield from _nodes(child)
+
+
+def _describe(node: dict, parents: dict[str, str]) -> str:
+    relation = node.get("Relation Name")
+    if relation in parents:
+        # One entry per partitioned table, whatever the partition count
+        return f"{node['Node Type']} on {parents[relation]} partition"
+    index = node.get("Index Name")
+    return node["Node Type"] + (f" on {relation}" if relation else "") + (f" using {index}" if index else "")
+
+
+async def run_checks(verbose: bool) -> list[str]:
+    captured: list[tuple[str, Any]] = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany) -> None:
+        # Multi-row INSERTs can't be EXPLAINed with their parameter batches
+        # and never scan anything anyway
+        if not executemany:
+            captured.append((statement, parameters))
+
+    failures = []
+    async with AsyncSessionLocal() as session:
+        sample = await Sample.load(session)
+        raw = (await (await session.connection()).get_raw_connection()).driver_connection
+        # Plans name partitions (activities_2026_10), not their parent table
+        partitions = await raw.fetch(
+            "SELECT c.relname, p.relname, c.reltuples FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid JOIN pg_class p ON p.oid = i.inhparent"
+        )
+        parents = {name: parent for name, parent, _ in partitions}
+        small = {name for name, _, rows in partitions if rows < SMALL_PARTITION_ROWS}
+        event.listen(engine.sync_engine, "before_cursor_execute", capture)
+        try:
+            for check in CHECKS:
+                captured.clear()
+                await check.run(session, sample)
+                await session.flush()
+                statements = list(captured)
+                scans, notes = [], []
+                for statement, parameters in statements:
+                    # EXPLAIN goes straight to asyncpg, so it isn't captured itself
+                    plan = await raw.fetchval(f"EXPLAIN (FORMAT JSON) {statement}", *(parameters or ()))
+                    if isinstance(plan, str):  # unless the app's json codec already decoded it
+                        plan = json.loads(plan)
+                    nodes = list(_nodes(plan[0]["Plan"]))
+                    scans.extend(_describe(n, parents) for n in nodes if n.get("Relation Name") or n.get("Index Name"))
+                    known = next((why for prefix, why in KNOWN_SEQ_SCANS.items() if statement.startswith(prefix)), None)
+                    for node in nodes:
+                        relation = node.get("Relation Name")
+                        if (
+                            node["Node Type"] == "Seq Scan"
+                            and parents.get(relation, relation) in LARGE_TABLES
+                            and relation not in small
+                        ):
+                            if known:
+                                notes.append(f"known Seq Scan on {relation}: {known}")
+                            else:
+                                failures.append(f"{check.name}: Seq Scan on {relation}\n    {statement}")
+                status = "FAIL" if any(f.startswith(check.name + ":") for f in failures) else "ok"
+                counts = Counter(scans)
+                print(f"{status:4} {check.name:32} {', '.join(f'{scan} x{n}' if n > 1 else scan for scan, n in counts.items())}")
+                for note in notes:
+                    print(f"       ({note})")
+                if verbose:
+                    for statement, _ in statements:
+                        print(f"       {' '.join(statement.split())[:160]}")
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", capture)
+            await session.rollback()
+    return failures
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--min-tasks", type=int, default=50_000, help="refuse to judge plans on fewer tasks than this")
+    parser.add_argument("--verbose", action="store_true", help="print the statements behind each check")
+    args = parser.parse_args()
+
+    async with AsyncSessionLocal() as session:
+        tasks = (await session.execute(select(func.count()).select_from(Task))).scalar_one()
+    if tasks < args.min_tasks:
+        raise SystemExit(f"Only {tasks} tasks loaded; generate a larger dataset first (see --help)")
+
+    failures = await run_checks(args.verbose)
+    if failures:
+        print("\nSequential scans on hot paths:")
+        for failure in failures:
+            print(f"  {failure}")
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
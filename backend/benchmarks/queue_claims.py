@@ -0,0 +1,73 @@
+"""Concurrent work queue claimers: throughput, claim latency, double assignment.
+
+``--claimers`` clients loop claim -> complete against ``/api/queue`` until
+``--claims`` tasks have been handed out (or the queue runs dry), then the
+script checks that no task was claimed twice. Completing moves each claimed
+task out of Ready, so point ``DATABASE_URL`` at a throwaway database:
+
+    python generate_data.py --tasks-per-status 2000
+    python -m benchmarks.queue_claims --claimers 24 --claims 2000
+
+Exits with status 1 if any task was handed to two claimers.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+from collections import Counter
+
+from benchmarks.common import asgi_client, login, summarize
+
+
+async def _claimer(client, remaining: list[int], claimed: list[str], samples: list[float], status: str) -> None:
+    while remaining[0] > 0:
+        remaining[0] -= 1
+        started = time.perf_counter()
+        response = await client.post("/api/queue/claim", json={})
+        samples.append(time.perf_counter() - started)
+        response.raise_for_status()
+        if response.status_code == 204:
+            return
+        lease = response.json()
+        claimed.append(lease["task_id"])
+        response = await client.post(
+            f"/api/queue/{lease['task_id']}/complete", json={"lease_token": lease["lease_token"], "status": status}
+        )
+        response.raise_for_status()
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--claimers", type=int, default=24, help="concurrent clients claiming tasks")
+    parser.add_argument("--claims", type=int, default=2000, help="tasks to claim in total")
+    parser.add_argument("--complete-to", default="Done", help="column completed tasks move to")
+    parser.add_argument("--username", default="admin")
+    parser.add_argument("--password", default="password")
+    args = parser.parse_args()
+
+    remaining, claimed, samples = [args.claims], [], []
+    clients = [asgi_client() for _ in range(args.claimers)]
+    for client in clients:
+        await login(client, args.username, args.password)
+    started = time.perf_counter()
+    await asyncio.gather(*(_claimer(c, remaining, claimed, samples, args.complete_to) for c in clients))
+    elapsed = time.perf_counter() - started
+    for client in clients:
+        await client.aclose()
+
+    duplicates = {task_id: n for task_id, n in Counter(claimed).items() if n > 1}
+    print(json.dumps({
+        "claimers": args.claimers,
+        "claimed": len(claimed),
+        "claims_per_second": round(len(claimed) / elapsed, 1),
+        "claim_latency": summarize(samples),
+        "double_assigned": len(duplicates),
+    }, indent=2))
+    if duplicates:
+        raise SystemExit(f"Tasks claimed more than once: {sorted(duplicates)[:10]}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,304 @@
+"""Per-route latency and query counts across dataset sizes.
+
+For every size in ``--sizes`` (tasks per board column) a temporary database
+is created next to the one in ``DATABASE_URL``, migrated, filled with
+``generate_data.py`` and dropped again at the end, so the database
+``DATABASE_URL`` names is never touched. Every route in ``tasks.py``,
+``activities.py``, ``comments.py`` and ``auth.py`` is then called
+``--iterations`` times in-process. ``--no-generate`` measures the database in
+``DATABASE_URL`` as it is instead; the requests do write to it.
+Only the request itself is timed; setup work such as creating the task a
+DELETE removes happens outside the measurement. Reports p50/p95/p99/max and
+the number of SQL statements each request ran (from ``X-Query-Count``).
+Query budgets are enforced strictly, so a route that runs more statements
+than its ``@query_budget`` allows stops the run.
+
+    python -m benchmarks.routes --sizes 100,2000 --write-baseline
+    python -m benchmarks.routes --sizes 100,2000 --compare benchmarks/baselines/routes.json
+
+``--write-baseline`` stores the results under ``benchmarks/baselines/`` so a
+change shows up as a diff of that file; ``--compare`` prints per-route
+changes against a stored baseline instead.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import subprocess
+import sys
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable
+from urllib.parse import urlsplit
+
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine
+
+# Must be set before the app (and its settings) are imported
+os.environ.setdefault("QUERY_COUNT_HEADERS", "true")
+os.environ.setdefault("QUERY_BUDGET_STRICT", "true")
+
+from app.core.config import get_settings
+from app.core.query_count import QUERY_BUDGET_HEADER, QUERY_COUNT_HEADER
+from benchmarks.common import asgi_client, login, summarize
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BASELINE = os.path.join(BACKEND_DIR, "benchmarks", "baselines", "routes.json")
+# bcrypt makes these deliberately slow; a few samples are enough
+SLOW_ROUTES = {"POST /auth/signup", "POST /auth/login"}
+
+
+@dataclass
+class Route:
+    name: str
+    # Untimed preparation; returns the request as (method, url, httpx kwargs)
+    prepare: Callable[["Context"], Awaitable[tuple[str, str, dict[str, Any]]]]
+
+
+class Context:
+    def __init__(self, client) -> None:
+        self.client = client
+        self.task_id: str = ""
+        self.neighbours: list[dict] = []
+        self.activity_cursor: str = ""
+
+    async def load(self) -> None:
+        column = (await self.client.get("/api/tasks/columns/Backlog", params={"limit": 3})).json()
+        self.task_id = column[0]["id"]
+        self.neighbours = column[1:3]
+        page = await self.client.get("/api/activities/", params={"limit": 50})
+        self.activity_cursor = page.headers.get("x-next-cursor", "")
+
+    async def fresh_task(self, **fields) -> dict:
+        response = await self.client.post("/api/tasks/", json={"title": "bench task", **fields})
+        response.raise_for_status()
+        return response.json()
+
+
+def _get(url: str, **kwargs) -> Callable[[Context], Awaitable[tuple[str, str, dict]]]:
+    async def prepare(ctx: Context):
+        return "GET", url.format(ctx=ctx), kwargs
+
+    return prepare
+
+
+async def _not_modified(ctx: Context):
+    etag = (await ctx.client.get("/api/tasks/columns/Done", params={"limit": 1})).headers["etag"]
+    return "GET", "/api/tasks/", {"headers": {"If-None-Match": etag}}
+
+
+async def _changes(ctx: Context):
+    # A far-future since returns no rows, just the current watermark; then
+    # one task changes before the timed sync
+    watermark = (await ctx.client.get("/api/tasks/changes", params={"since": 2**62})).json()["watermark"]
+    await ctx.fresh_task()
+    return "GET", "/api/tasks/changes", {"params": {"since": watermark}}
+
+
+async def _patch(ctx: Context):
+    task = await ctx.fresh_task()
+    return "PATCH", f"/api/tasks/{task['id']}", {"json": {"priority": "P0", "title": "edited", "if_match": task["version"]}}
+
+
+async def _reorder(ctx: Context):
+    task = await ctx.fresh_task()
+    body = {"new_status": "Ready", "new_ordering_index": 1.5, "if_match": task["version"]}
+    return "POST", f"/api/tasks/{task['id']}/reorder", {"json": body}
+
+
+async def _move(ctx: Context):
+    task = await ctx.fresh_task()
+    body = {"after_id": ctx.neighbours[0]["id"], "before_id": ctx.neighbours[1]["id"], "if_match": task["version"]}
+    return "POST", f"/api/tasks/{task['id']}/move", {"json": body}
+
+
+async def _bulk(ctx: Context):
+    ids = [(await ctx.fresh_task())["id"] for _ in range(20)]
+    return "POST", "/api/tasks/bulk", {"json": {"task_ids": ids, "status": "Review", "priority": "P1"}}
+
+
+async def _delete(ctx: Context):
+    task = await ctx.fresh_task()
+    return "DELETE", f"/api/tasks/{task['id']}", {}
+
+
+async def _create(ctx: Context):
+    return "POST", "/api/tasks/", {"json": {"title": "bench task", "status": "Ready", "tags": {"labels": ["bench"]}}}
+
+
+async def _comment(ctx: Context):
+    return "POST", f"/api/comments/task/{ctx.task_id}", {"json": {"body": "bench comment", "actor": "admin"}}
+
+
+async def _signup(ctx: Context):
+    name = f"bench{uuid.uuid4().hex[:12]}"
+    return "POST", "/api/auth/signup", {"json": {"email": f"{name}@example.com", "username": name, "password": "password"}}
+
+
+async def _login(ctx: Context):
+    return "POST", "/api/auth/login", {"json": {"username": "admin", "password": "password"}}
+
+
+async def _logout(ctx: Context):
+    # Logging out drops the session cookie; log back in first (untimed)
+    await login(ctx.client, "admin", "password")
+    return "POST", "/api/auth/logout", {}
+
+
+ROUTES = [
+    Route("GET /tasks/", _get("/api/tasks/")),
+    Route("GET /tasks/?sort=priority", _get("/api/tasks/", params={"sort": "priority"})),
+    Route("GET /tasks/ (304)", _not_modified),
+    Route("GET /tasks/board", _get("/api/tasks/board")),
+    Route("GET /tasks/columns/{column}", _get("/api/tasks/columns/Ready", params={"limit": 50})),
+    Route("GET /tasks/changes?since", _changes),
+    Route("POST /tasks/", _create),
+    Route("PATCH /tasks/{id}", _patch),
+    Route("POST /tasks/{id}/reorder", _reorder),
+    Route("POST /tasks/{id}/move", _move),
+    Route("POST /tasks/bulk (20)", _bulk),
+    Route("DELETE /tasks/{id}", _delete),
+    Route("GET /activities/", _get("/api/activities/")),
+    Route("GET /activities/?cursor", lambda ctx: _get("/api/activities/", params={"cursor": ctx.activity_cursor})(ctx)),
+    Route("GET /activities/task/{id}", _get("/api/activities/task/{ctx.task_id}")),
+    Route("GET /comments/task/{id}", _get("/api/comments/task/{ctx.task_id}")),
+    Route("POST /comments/task/{id}", _comment),
+    Route("POST /auth/signup", _signup),
+    Route("POST /auth/login", _login),
+    Route("GET /auth/me", _get("/api/auth/me")),
+    Route("GET /auth/users", _get("/api/auth/users")),
+    Route("POST /auth/logout", _logout),
+]
+
+
+async def _measure(route: Route, ctx: Context, iterations: int) -> dict[str, Any]:
+    samples: list[float] = []
+    queries: list[int] = []
+    budget = None
+    for _ in range(iterations):
+        method, url, kwargs = await route.prepare(ctx)
+        started = time.perf_counter()
+        response = await ctx.client.request(method, url, **kwargs)
+        samples.append(time.perf_counter() - started)
+        if response.status_code >= 400:
+            raise RuntimeError(f"{route.name}: HTTP {response.status_code} {response.text[:200]}")
+        queries.append(int(response.headers[QUERY_COUNT_HEADER]))
+        budget = response.headers.get(QUERY_BUDGET_HEADER)
+    # Median, so a one-off cache miss doesn't define the route's query count
+    queries.sort()
+    return {
+        **summarize(samples),
+        "queries": queries[len(queries) // 2],
+        "queries_max": queries[-1],
+        "query_budget": int(budget) if budget is not None else None,
+    }
+
+
+@contextlib.asynccontextmanager
+async def temporary_database(url: str) -> AsyncIterator[str]:
+    """Create a database migrated to head on the server of ``url``; drops it on exit.
+
+    Yields its URL. ``DATABASE_URL`` points there for the duration, for the
+    app (imported later) and the scripts run as subprocesses alike.
+    """
+    target = make_url(url)
+    name = f"{target.database}_bench_{uuid.uuid4().hex[:8]}"
+    server = create_async_engine(target.set(database="postgres"), isolation_level="AUTOCOMMIT")
+    previous = os.environ.get("DATABASE_URL")
+    try:
+        async with server.connect() as conn:
+            await conn.execute(text(f'CREATE DATABASE "{name}"'))
+        # Swapped in textually: a re-rendered URL percent-encodes its query,
+        # which alembic's config parser would take for interpolation
+        temporary = urlsplit(url)._replace(path=f"/{name}").geturl()
+        os.environ["DATABASE_URL"] = temporary
+        try:
+            subprocess.run(
+                [sys.executable, "-m", "alembic", "upgrade", "head"], cwd=BACKEND_DIR, check=True, capture_output=True
+            )
+            yield temporary
+        finally:
+            if previous is None:
+                del os.environ["DATABASE_URL"]
+            else:
+                os.environ["DATABASE_URL"] = previous
+            if "app.core.db" in sys.modules:
+                await sys.modules["app.core.db"].engine.dispose()
+            async with server.connect() as conn:
+                await conn.execute(text(f'DROP DATABASE "{name}" WITH (FORCE)'))
+    finally:
+        await server.dispose()
+
+
+async def run_size(tasks_per_status: int, iterations: int, generate: bool) -> dict[str, Any]:
+    if generate:
+        # Rebuilds the temporary database: generate_data.py starts by emptying it
+        subprocess.run(
+            [sys.executable, "generate_data.py", "--tasks-per-status", str(tasks_per_status), "--users", "20"],
+            cwd=BACKEND_DIR, check=True, capture_output=True,
+        )
+    async with asgi_client() as client:
+        await login(client, "admin", "password")
+        ctx = Context(client)
+        await ctx.load()
+        results = {}
+        for route in ROUTES:
+            count = min(iterations, 5) if route.name in SLOW_ROUTES else iterations
+            results[route.name] = await _measure(route, ctx, count)
+    return results
+
+
+def compare(results: dict[str, Any], baseline: dict[str, Any]) -> None:
+    for size, routes in results.items():
+        print(f"\n{size}")
+        print(f"{'route':36} {'p50 ms':>16} {'p95 ms':>16} {'queries':>9} {'budget':>6}")
+        for name, now in routes.items():
+            budget = "-" if now["query_budget"] is None else now["query_budget"]
+            before = baseline.get(size, {}).get(name)
+            if before is None:
+                print(f"{name:36} {now['p50_ms']:>16} {now['p95_ms']:>16} {now['queries']:>9} {budget:>6}  (new)")
+                continue
+            p50 = f"{before['p50_ms']}->{now['p50_ms']}"
+            p95 = f"{before['p95_ms']}->{now['p95_ms']}"
+            queries = f"{before['queries']}->{now['queries']}" if before["queries"] != now["queries"] else str(now["queries"])
+            flag = "  REGRESSION" if now["p95_ms"] > before["p95_ms"] * 1.5 or now["queries"] > before["queries"] else ""
+            print(f"{name:36} {p50:>16} {p95:>16} {queries:>9} {budget:>6}{flag}")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="100,2000", help="comma-separated tasks per status column")
+    parser.add_argument("--iterations", type=int, default=50, help="requests per route")
+    parser.add_argument("--no-generate", action="store_true", help="measure the current data as is (single size)")
+    parser.add_argument("--write-baseline", nargs="?", const=DEFAULT_BASELINE, help="store results as a JSON baseline")
+    parser.add_argument("--compare", nargs="?", const=DEFAULT_BASELINE, help="diff results against a JSON baseline")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    if args.no_generate:
+        sizes = sizes[:1]
+    results = {}
+    async with contextlib.AsyncExitStack() as stack:
+        if not args.no_generate:
+            await stack.enter_async_context(temporary_database(get_settings().database_url))
+        for size in sizes:
+            results[f"{size}_per_status"] = await run_size(size, args.iterations, generate=not args.no_generate)
+
+    if args.compare:
+        with open(args.compare) as handle:
+            compare(results, json.load(handle))
+    else:
+        print(json.dumps(results, indent=2))
+    if args.write_baseline:
+        with open(args.write_baseline, "w") as handle:
+            json.dump(results, handle, indent=2, sort_keys=True)
+            handle.write("\n")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,94 @@
+"""Cost of turning a large task list into a response body, per code path.
+
+Builds ``--tasks`` in-memory Task rows, then times:
+
+* ``response_model``: what FastAPI does for ``response_model=list[TaskRead]``
+  (validate every row into a model, dump it back to JSON-able data) followed
+  by the stdlib JSON encoding of ``JSONResponse``;
+* ``fast_path``: ``app.core.responses.rows_response``, projecting the rows
+  onto the schema fields and encoding them with orjson.
+
+Both bodies are checked to decode to the same document. No database needed:
+
+    python -m benchmarks.serialization --tasks 20000 --rounds 10
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.core.responses import rows_response
+from app.models.task import Task
+from app.schemas.task import TaskRead
+from benchmarks.common import summarize
+
+STATUSES = ("Backlog", "Ready", "In Progress", "Review", "Done")
+
+
+def _tasks(count: int) -> list[Task]:
+    now = datetime.now(timezone.utc)
+    return [
+        Task(
+            id=uuid.uuid4(),
+            title=f"Task {i}",
+            description="Lorem ipsum dolor sit amet " * 4,
+            status=STATUSES[i % len(STATUSES)],
+            priority=f"P{i % 4}",
+            owner="admin" if i % 3 else None,
+            tags={"area": "backend", "sprint": i % 12},
+            estimate=i % 8 or None,
+            ordering_index=float(i * 1000),
+            version=1 + i % 5,
+            created_at=now - timedelta(minutes=i),
+            updated_at=now,
+        )
+        for i in range(count)
+    ]
+
+
+async def _response_model(field, tasks: list[Task]) -> bytes:
+    content = await serialize_response(field=field, response_content=tasks, is_coroutine=True)
+    return JSONResponse(content).body
+
+
+def _fast_path(tasks: list[Task]) -> bytes:
+    return rows_response(tasks, TaskRead).body
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=20_000, help="rows per response")
+    parser.add_argument("--rounds", type=int, default=10, help="timed serializations per path")
+    args = parser.parse_args()
+
+    tasks = _tasks(args.tasks)
+    field = create_response_field(name="list_tasks_response", type_=list[TaskRead], mode="serialization")
+
+    if json.loads(await _response_model(field, tasks)) != json.loads(_fast_path(tasks)):
+        raise SystemExit("fast path output differs from response_model output")
+
+    samples: dict[str, list[float]] = {"response_model": [], "fast_path": []}
+    for _ in range(args.rounds):
+        started = time.perf_counter()
+        await _response_model(field, tasks)
+        samples["response_model"].append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        _fast_path(tasks)
+        samples["fast_path"].append(time.perf_counter() - started)
+
+    results = {"tasks": args.tasks, **{name: summarize(runs) for name, runs in samples.items()}}
+    results["speedup_p50"] = round(results["response_model"]["p50_ms"] / results["fast_path"]["p50_ms"], 1)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
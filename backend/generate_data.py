@@ -0,0 +1,198 @@
+import argparse
+import asyncio
+import logging
+import math
+import random
+import sys
+import os
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+# Ensure the backend directory is in the python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import func, insert, select, text
+from app.core.db import AsyncSessionLocal
+from app.core.responses import json_bytes
+from app.core.security import get_password_hash
+from app.models.task import Task
+from app.models.user import User
+from app.services import partition_service, revision_service
+from app.services.import_service import ACTIVITY_COLUMNS, COMMENT_COLUMNS, TASK_COLUMNS
+from app.services.ordering_service import ORDERING_STEP
+from app.services.task_service import COLUMNS
+from seed import clean_db, seed_db
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+PRIORITIES = ("P0", "P1", "P2", "P3")
+PRIORITY_WEIGHTS = (1, 3, 5, 3)
+WORDS = (
+    "api auth board bug cache column comment config deploy design docs drag drop endpoint error "
+    "feed filter fix flaky frontend index latency layout login migration mobile modal owner "
+    "pagination perf priority query refactor release review schema search session sidebar sort "
+    "spike staging status sync test timeout token ui upgrade validation websocket"
+).split()
+EVENT_TYPES = ("updated", "moved", "commented")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generate a large, reproducible board dataset on top of seed.py's fixtures.")
+    parser.add_argument("--users", type=int, default=50, help="generated users (in addition to the seed users)")
+    parser.add_argument("--tasks-per-status", type=int, default=10_000, help="tasks in each board column")
+    parser.add_argument("--activities-per-task", type=float, default=8.0, help="mean activities per task, 'created' included")
+    parser.add_argument("--comments-per-task", type=float, default=2.0, help="mean comments per task")
+    parser.add_argument("--tag-cardinality", type=int, default=200, help="distinct labels to draw task tags from")
+    parser.add_argument("--description-median", type=int, default=300, help="median description length in characters")
+    parser.add_argument("--description-sigma", type=float, default=1.0, help="log-normal spread of description lengths")
+    parser.add_argument("--description-max", type=int, default=20_000, help="longest description generated")
+    parser.add_argument("--days", type=int, default=365, help="history span the timestamps are spread over")
+    parser.add_argument("--seed", type=int, default=42, help="random seed; the same seed yields the same dataset")
+    parser.add_argument("--batch-size", type=int, default=5000, help="tasks per COPY batch and commit")
+    parser.add_argument("--append", action="store_true", help="keep existing data instead of re-running seed.py first")
+    return parser.parse_args()
+
+
+class Generator:
+    def __init__(self, args, owners: list[str], seed: int | str):
+        self.args = args
+        self.rng = random.Random(seed)
+        self.owners = owners
+        self.labels = [f"{self.rng.choice(WORDS)}-{i}" for i in range(args.tag_cardinality)]
+        # Fixed anchor rather than now(): the same seed must give identical rows
+        self.end = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        self.span = timedelta(days=args.days).total_seconds()
+
+    def uuid(self) -> uuid.UUID:
+        return uuid.UUID(int=self.rng.getrandbits(128), version=4)
+
+    def timestamp(self, after: datetime | None = None) -> datetime:
+        if after is None:
+            return self.end - timedelta(seconds=self.rng.random() * self.span)
+        return after + timedelta(seconds=self.rng.random() * (self.end - after).total_seconds())
+
+    def sentence(self, words: int) -> str:
+        return " ".join(self.rng.choices(WORDS, k=words))
+
+    def description(self) -> str | None:
+        if self.rng.random() < 0.1:
+            return None
+        size = self.rng.lognormvariate(math.log(self.args.description_median), self.args.description_sigma)
+        size = max(1, min(int(size), self.args.description_max))
+        return (self.sentence(size // 5 + 1) + " ")[:size]
+
+    def count(self, mean: float) -> int:
+        # Geometric-ish spread around the mean: most tasks are quiet, a few are busy
+        return int(self.rng.expovariate(1 / mean)) if mean > 0 else 0
+
+    def batch(self, status: str, tail: float, first: int, size: int):
+        tasks, activities, comments = [], [], []
+        for position in range(first, first + size):
+            task_id = self.uuid()
+            created_at = self.timestamp()
+            owner = self.rng.choice(self.owners) if self.rng.random() < 0.8 else None
+            title = self.sentence(self.rng.randint(3, 8)).capitalize()
+            history = 1 + self.count(self.args.activities_per_task - 1)
+            when = created_at
+            activities.append((self.uuid(), task_id, "created", json_bytes({"title": title}).decode(), owner or "admin", 1, when))
+            for seq in range(2, history + 1):
+                when = self.timestamp(when)
+                kind = self.rng.choice(EVENT_TYPES)
+                if kind == "moved":
+                    old, new = self.rng.sample(COLUMNS, 2)
+                    payload = {"old_status": old, "new_status": new}
+                elif kind == "updated":
+                    old, new = self.rng.sample(PRIORITIES, 2)
+                    payload = {"old_priority": old, "new_priority": new}
+                else:
+                    payload = {"body": self.sentence(self.rng.randint(3, 20))}
+                activities.append((self.uuid(), task_id, kind, json_bytes(payload).decode(), self.rng.choice(self.owners), seq, when))
+            for _ in range(self.count(self.args.comments_per_task)):
+                comments.append((
+                    self.uuid(), task_id, self.sentence(self.rng.randint(3, 40)), self.rng.choice(self.owners),
+                    self.timestamp(created_at), 1,
+                ))
+            tags = {"labels": self.rng.sample(self.labels, k=min(len(self.labels), self.rng.randint(0, 4)))}
+            tasks.append((
+                task_id, title, self.description(), status,
+                self.rng.choices(PRIORITIES, weights=PRIORITY_WEIGHTS)[0], tail + (position + 1) * ORDERING_STEP,
+                owner, json_bytes(tags).decode(), self.rng.choice((None, 1, 2, 3, 5, 8, 13)), 1, history,
+                created_at, when,
+            ))
+        return tasks, activities, comments
+
+
+async def create_users(session, count: int, seed: int | str) -> list[str]:
+    hashed_password = get_password_hash("password")  # one bcrypt round for everyone
+    rng = random.Random(seed)
+    # Appending: continue numbering after the users generated by earlier runs
+    result = await session.execute(select(func.count()).select_from(User).where(User.username.like("user%")))
+    start = result.scalar_one()
+    users = [
+        {
+            "id": uuid.UUID(int=rng.getrandbits(128), version=4),
+            "email": f"user{i:05d}@example.com",
+            "username": f"user{i:05d}",
+            "hashed_password": hashed_password,
+            "full_name": f"Generated User {i}",
+            "is_active": True,
+        }
+        for i in range(start, start + count)
+    ]
+    if users:
+        await session.execute(insert(User), users)
+    await session.commit()
+    return [user["username"] for user in users]
+
+
+async def main():
+    """Bulk-load a synthetic board: N tasks per column with activity and comment history."""
+    args = parse_args()
+    started = time.perf_counter()
+    async with AsyncSessionLocal() as session:
+        seed: int | str = args.seed
+        if not args.append:
+            await clean_db(session)
+            await seed_db(session)
+        else:
+            # Mixed with what is already there, so appending with the same
+            # --seed doesn't draw the ids of the earlier run again
+            result = await session.execute(select(func.count()).select_from(Task))
+            seed = f"{args.seed}/{result.scalar_one()}"
+        owners = ["admin", "member1", "member2"] + await create_users(session, args.users, seed)
+        generator = Generator(args, owners, seed)
+
+        # Monthly activities partitions for the whole generated history
+        await partition_service.ensure_partitions(session, generator.end - timedelta(days=args.days), generator.end)
+        connection = await session.connection()
+        raw = (await connection.get_raw_connection()).driver_connection
+        # Appending: start after whatever each column already holds
+        tails = dict(await raw.fetch("SELECT status, max(ordering_index) FROM tasks GROUP BY status"))
+        totals = {"tasks": 0, "activities": 0, "comments": 0}
+        for status in COLUMNS:
+            for first in range(0, args.tasks_per_status, args.batch_size):
+                size = min(args.batch_size, args.tasks_per_status - first)
+                tasks, activities, comments = generator.batch(status, tails.get(status, 0.0), first, size)
+                await raw.copy_records_to_table("tasks", records=tasks, columns=TASK_COLUMNS)
+                await raw.copy_records_to_table("activities", records=activities, columns=ACTIVITY_COLUMNS)
+                await raw.copy_records_to_table("comments", records=comments, columns=COMMENT_COLUMNS)
+                await session.commit()
+                connection = await session.connection()
+                raw = (await connection.get_raw_connection()).driver_connection
+                totals["tasks"] += len(tasks)
+                totals["activities"] += len(activities)
+                totals["comments"] += len(comments)
+                logger.info(f"{status}: {first + size}/{args.tasks_per_status} tasks ({totals})")
+
+        revision_service.mark_changed(session)
+        await session.commit()
+        # Fresh statistics so the planner sees the new table sizes right away
+        for table in ("users", "tasks", "activities", "comments"):
+            await session.execute(text(f"ANALYZE {table}"))
+        await session.commit()
+    logger.info(f"Generated {totals} in {time.perf_counter() - started:.1f}s")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,41 @@
+import argparse
+import asyncio
+import logging
+import sys
+import os
+
+# Ensure the backend directory is in the python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.services import import_service
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def _file_lines(path: str):
+    with open(path, encoding="utf-8", newline="") as handle:
+        for line in handle:
+            yield line
+
+
+async def main():
+    """Bulk-load tasks from an NDJSON or CSV file (see POST /api/import/tasks)."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("path", help="file to import; .csv is read as CSV, anything else as NDJSON")
+    parser.add_argument("--format", choices=("ndjson", "csv"), help="override the format guessed from the extension")
+    parser.add_argument("--actor", default="import", help="actor recorded on the 'created' activities")
+    parser.add_argument("--batch-size", type=int, help="tasks per COPY batch (default: IMPORT_BATCH_SIZE)")
+    args = parser.parse_args()
+
+    fmt = args.format or ("csv" if args.path.lower().endswith(".csv") else "ndjson")
+    reports = import_service.import_tasks(
+        _file_lines(args.path), fmt, actor=args.actor, batch_size=args.batch_size
+    )
+    async for report in reports:
+        for error in report["errors"]:
+            logger.warning(f"Row {error['row']}: {error['error']}")
+        logger.info(f"{report['imported']} tasks, {report['comments']} comments imported; {report['failed']} rows failed")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,27 @@
+import asyncio
+import logging
+import sys
+import os
+
+# Ensure the backend directory is in the python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.db import AsyncSessionLocal
+from app.services import ordering_service
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def main():
+    """Renumber every board column whose ordering_index gaps have collapsed."""
+    async with AsyncSessionLocal() as session:
+        renumbered = await ordering_service.rebalance_crowded_columns(session)
+        await session.commit()
+    if not renumbered:
+        logger.info("All columns have room; nothing to rebalance.")
+    for status, count in renumbered.items():
+        logger.info(f"Rebalanced '{status}': {count} tasks renumbered")
+
+if __name__ == "__main__":
+    asyncio.run(main())
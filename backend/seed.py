@@ -13,6 +13,8 @@ from app.models.user import User
 from app.models.task import Task, Status, Priority
 from app.models.comment import Comment
 from app.models.activity import Activity, ActivityType
+from app.models.tombstone import TaskTombstone
+from app.services import revision_service
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -22,7 +24,10 @@ async def clean_db(session):
     await session.execute(delete(Activity))
     await session.execute(delete(Comment))
     await session.execute(delete(Task))
+    await session.execute(delete(TaskTombstone))
     await session.execute(delete(User))
+    # Cached board reads are stale now
+    revision_service.mark_changed(session)
     await session.commit()
     logger.info("Database cleaned.")
 
@@ -57,6 +62,9 @@ async def seed_db(session):
     )
     
     session.add_all([admin, member1, member2])
+    # Each commit here bumps the board revision: a reader between two of
+    # them caches a partial board, which must not stay fresh
+    revision_service.mark_changed(session)
     await session.commit()
     
     # Refresh users to get IDs
@@ -131,6 +139,7 @@ async def seed_db(session):
     ]
     
     session.add_all(tasks)
+    revision_service.mark_changed(session)
     await session.commit()
     
     # Refresh tasks to get IDs for relations
@@ -178,7 +187,9 @@ async def seed_db(session):
         )
     ]
     session.add_all(activities)
+    bug_task.last_activity_seq = len(activities)
     
+    revision_service.mark_changed(session)
     await session.commit()
     logger.info("Database seeded successfully!")
 
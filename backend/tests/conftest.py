@@ -0,0 +1,107 @@
+"""Shared test setup.
+
+Most tests need nothing but the code. Tests using the ``api`` fixture drive
+the app in-process against a throwaway database, created next to the one in
+``DATABASE_URL``, migrated and seeded before collection and dropped at the
+end; they are skipped when no server can be reached. Requests run with
+``QUERY_BUDGET_STRICT``, so one that overruns its route's budget fails.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import subprocess
+import sys
+import uuid
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+from urllib.parse import urlsplit
+
+import pytest
+
+# Before any test module imports the app and its settings
+os.environ["QUERY_BUDGET_STRICT"] = "true"
+os.environ["QUERY_COUNT_HEADERS"] = "true"
+
+from sqlalchemy import text  # noqa: E402
+from sqlalchemy.engine import make_url  # noqa: E402
+from sqlalchemy.exc import SQLAlchemyError  # noqa: E402
+from sqlalchemy.ext.asyncio import create_async_engine  # noqa: E402
+
+from app.core.config import get_settings  # noqa: E402
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+_server_url: str | None = None
+_database: str | None = None
+_skip_reason = "no database server"
+
+
+def _on_server(url: str, statement: str) -> None:
+    async def run() -> None:
+        engine = create_async_engine(
+            make_url(url).set(database="postgres"), isolation_level="AUTOCOMMIT", connect_args={"timeout": 5}
+        )
+        try:
+            async with engine.connect() as conn:
+                await conn.execute(text(statement))
+        finally:
+            await engine.dispose()
+
+    asyncio.run(run())
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    # Here rather than in a fixture: app.core.db builds its engine from
+    # DATABASE_URL when first imported, which collection does
+    global _server_url, _database, _skip_reason
+    url = get_settings().database_url
+    name = f"{make_url(url).database}_test_{uuid.uuid4().hex[:8]}"
+    try:
+        _on_server(url, f'CREATE DATABASE "{name}"')
+    except (OSError, SQLAlchemyError) as exc:
+        _skip_reason = f"no database server: {exc}"
+        return
+    _server_url, _database = url, name
+    # Swapped in textually: a re-rendered URL percent-encodes its query
+    os.environ["DATABASE_URL"] = urlsplit(url)._replace(path=f"/{name}").geturl()
+    for args in (["-m", "alembic", "upgrade", "head"], ["seed.py"]):
+        try:
+            subprocess.run([sys.executable, *args], cwd=BACKEND_DIR, check=True, capture_output=True)
+        except subprocess.CalledProcessError as exc:
+            pytest_unconfigure(config)
+            raise pytest.UsageError(f"Preparing the test database failed:\n{exc.stderr.decode()}") from exc
+
+
+def pytest_unconfigure(config: pytest.Config) -> None:
+    global _database
+    if _database is not None:
+        _on_server(_server_url, f'DROP DATABASE "{_database}" WITH (FORCE)')
+        _database = None
+
+
+Scenario = Callable[[Any], Awaitable[Any]]
+
+
+@pytest.fixture
+def api() -> Callable[[Scenario], Any]:
+    """Run ``scenario(client)`` with an httpx client logged in as the seeded admin."""
+    if _database is None:
+        pytest.skip(_skip_reason)
+
+    def run(scenario: Scenario) -> Any:
+        async def main() -> Any:
+            from app.core.db import engine
+            from benchmarks.common import asgi_client, login
+
+            try:
+                async with asgi_client() as client:
+                    await login(client, "admin", "password")
+                    return await scenario(client)
+            finally:
+                # Pooled connections belong to this test's event loop
+                await engine.dispose()
+
+        return asyncio.run(main())
+
+    return run
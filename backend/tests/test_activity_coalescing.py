@@ -0,0 +1,36 @@
+from app.services.activity_service import merge_updated_payloads
+
+
+def test_keeps_first_old_and_last_new():
+    earlier = {"old_priority": "P2", "new_priority": "P1", "title": "first"}
+    later = {"old_priority": "P1", "new_priority": "P0", "title": "second"}
+
+    assert merge_updated_payloads(earlier, later) == {"old_priority": "P2", "new_priority": "P0", "title": "second"}
+
+
+def test_fields_from_either_side_are_kept():
+    earlier = {"old_status": "Ready", "new_status": "Review"}
+    later = {"old_owner": None, "new_owner": "alice", "description": True, "estimate": 3}
+
+    assert merge_updated_payloads(earlier, later) == {
+        "old_status": "Ready",
+        "new_status": "Review",
+        "old_owner": None,
+        "new_owner": "alice",
+        "description": True,
+        "estimate": 3,
+    }
+
+
+def test_pairs_that_cancel_out_are_dropped():
+    earlier = {"old_priority": "P2", "new_priority": "P1", "title": "renamed"}
+    later = {"old_priority": "P1", "new_priority": "P2"}
+
+    assert merge_updated_payloads(earlier, later) == {"title": "renamed"}
+
+
+def test_everything_cancelling_out_leaves_nothing():
+    earlier = {"old_priority": "P2", "new_priority": "P1"}
+    later = {"old_priority": "P1", "new_priority": "P2"}
+
+    assert merge_updated_payloads(earlier, later) == {}
@@ -0,0 +1,80 @@
+import asyncio
+import uuid
+from types import SimpleNamespace
+
+from app.services.ordering_service import ORDERING_STEP, position_between
+
+
+class FakeResult:
+    def __init__(self, value):
+        self.value = value
+
+    def scalar_one_or_none(self):
+        return self.value
+
+    def scalar_one(self):
+        return self.value
+
+
+class FakeSession:
+    """Answers each statement with the next scripted value and records it."""
+
+    def __init__(self, *values):
+        self.values = list(values)
+        self.statements = []
+
+    async def execute(self, statement):
+        self.statements.append(str(statement))
+        return FakeResult(self.values.pop(0))
+
+
+def _card(ordering_index: float) -> SimpleNamespace:
+    return SimpleNamespace(id=uuid.uuid4(), ordering_index=ordering_index)
+
+
+def _position(session, *, after=None, before=None) -> float:
+    return asyncio.run(position_between(session, "Ready", uuid.uuid4(), after=after, before=before))
+
+
+def test_between_two_neighbours_bisects_without_a_query():
+    assert _position(None, after=_card(1000.0), before=_card(2000.0)) == 1500.0
+
+
+def test_after_a_card_looks_up_the_next_one():
+    session = FakeSession(3000.0)
+
+    assert _position(session, after=_card(1000.0)) == 2000.0
+    (following,) = session.statements
+    assert "ORDER BY tasks.ordering_index, tasks.id" in following
+
+
+def test_after_the_last_card_steps_past_it():
+    session = FakeSession(None)
+
+    assert _position(session, after=_card(1000.0)) == 1000.0 + ORDERING_STEP
+
+
+def test_before_a_card_looks_up_the_previous_one():
+    session = FakeSession(1000.0)
+
+    assert _position(session, before=_card(2000.0)) == 1500.0
+
+
+def test_before_the_first_card_bisects_from_zero():
+    session = FakeSession(None)
+
+    assert _position(session, before=_card(1000.0)) == 500.0
+
+
+def test_append_reads_the_tail():
+    session = FakeSession(4000.0)
+
+    assert _position(session) == 4000.0 + ORDERING_STEP
+    (tail,) = session.statements
+    assert "max(tasks.ordering_index)" in tail
+
+
+def test_append_to_an_empty_column():
+    session = FakeSession(None)
+
+    assert _position(session) == ORDERING_STEP
@@ -0,0 +1,95 @@
+import asyncio
+import base64
+import json
+import uuid
+
+import pytest
+from fastapi import HTTPException, Response
+
+from app.api.routes import activities
+from app.core.pagination import decode_cursor, encode_cursor
+
+
+def _raw(values) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip("=")
+
+
+def test_round_trip():
+    activity_id = uuid.uuid4()
+    cursor = encode_cursor("2026-10-17T12:00:00+00:00", activity_id)
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor, 2) == ["2026-10-17T12:00:00+00:00", str(activity_id)]
+
+
+def test_values_are_stringified():
+    assert decode_cursor(encode_cursor(42), 1) == ["42"]
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "",
+        "not base64!",
+        encode_cursor("a", "b", "c"),  # wrong arity
+        "eyJhIjoxfQ",  # valid JSON, but an object
+        _raw([1, 2]),
+        _raw(["2026-10-17T12:00:00+00:00", None]),
+        _raw([["a"], {"b": 1}]),
+    ],
+)
+def test_malformed_cursors_are_a_400(cursor):
+    with pytest.raises(HTTPException) as excinfo:
+        decode_cursor(cursor, 2)
+    assert excinfo.value.status_code == 400
+
+
+def _task_feed(task_id: uuid.UUID, cursor: str):
+    # Rejected before the database is touched
+    return asyncio.run(
+        activities.list_task_activities(
+            task_id, Response(), db=None, limit=50, offset=0, cursor=cursor, exclude_type=None
+        )
+    )
+
+
+NOW = "2026-10-17T12:00:00+00:00"
+
+
+@pytest.mark.parametrize("seq", ["²", "x", "", "1.5"])
+def test_task_feed_rejects_a_sequence_that_is_not_an_integer(seq):
+    task_id = uuid.uuid4()
+    with pytest.raises(HTTPException) as excinfo:
+        _task_feed(task_id, encode_cursor(task_id, seq, NOW))
+    assert excinfo.value.status_code == 400
+
+
+def test_task_feed_rejects_a_bad_timestamp():
+    task_id = uuid.uuid4()
+    with pytest.raises(HTTPException) as excinfo:
+        _task_feed(task_id, encode_cursor(task_id, 5, "yesterday"))
+    assert excinfo.value.status_code == 400
+
+
+def test_task_feed_rejects_another_tasks_cursor():
+    with pytest.raises(HTTPException) as excinfo:
+        _task_feed(uuid.uuid4(), encode_cursor(uuid.uuid4(), 5, NOW))
+    assert excinfo.value.status_code == 400
+
+
+def test_task_feed_rejects_a_cursor_without_created_at():
+    task_id = uuid.uuid4()
+    with pytest.raises(HTTPException) as excinfo:
+        _task_feed(task_id, encode_cursor(task_id, 5))
+    assert excinfo.value.status_code == 400
+
+
+def test_global_feed_rejects_a_bad_timestamp():
+    cursor = encode_cursor("yesterday", uuid.uuid4())
+    with pytest.raises(HTTPException) as excinfo:
+        asyncio.run(
+            activities.list_all_activities(
+                Response(), db=None, limit=100, offset=0, cursor=cursor, type=None, exclude_type=None
+            )
+        )
+    assert excinfo.value.status_code == 400
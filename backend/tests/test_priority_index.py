@@ -0,0 +1,121 @@
+import random
+import uuid
+from types import SimpleNamespace
+
+from app.core.priority_index import PriorityIndex
+
+WEIGHTS = {"P0": 0, "P1": 1, "P2": 2, "P3": 3}
+
+
+def _task(priority: str, ordering_index: float, owner: str | None = None) -> SimpleNamespace:
+    return SimpleNamespace(id=uuid.uuid4(), priority=priority, ordering_index=ordering_index, owner=owner)
+
+
+def _expected(tasks: dict, k: int, owner: str | None = None) -> list[uuid.UUID]:
+    live = [t for t in tasks.values() if owner is None or t.owner == owner]
+    live.sort(key=lambda t: (WEIGHTS[t.priority], t.ordering_index, t.id))
+    return [t.id for t in live[:k]]
+
+
+def test_top_orders_by_priority_then_position_then_id():
+    tied = sorted([uuid.uuid4(), uuid.uuid4()])
+    rows = [
+        _task("P2", 1000.0),
+        _task("P0", 3000.0),
+        _task("P0", 2000.0),
+        SimpleNamespace(id=tied[1], priority="P1", ordering_index=500.0, owner=None),
+        SimpleNamespace(id=tied[0], priority="P1", ordering_index=500.0, owner=None),
+    ]
+    index = PriorityIndex(WEIGHTS)
+    index.load(rows, watermark=7)
+
+    assert index.loaded and index.watermark == 7
+    assert index.top(5) == [rows[2].id, rows[1].id, tied[0], tied[1], rows[0].id]
+    assert index.top(2) == [rows[2].id, rows[1].id]
+    assert index.top(50) == index.top(5)
+
+
+def test_owner_filter_and_owner_change():
+    alice = _task("P1", 1000.0, "alice")
+    bob = _task("P0", 2000.0, "bob")
+    index = PriorityIndex(WEIGHTS)
+    index.load([alice, bob], watermark=1)
+
+    assert index.top(10, "alice") == [alice.id]
+    assert index.top(10, "carol") == []
+
+    # Reassigned: leaves alice's heap, joins bob's
+    index.upsert(alice.id, "P1", 1000.0, "bob")
+    assert index.top(10, "alice") == []
+    assert index.top(10, "bob") == [bob.id, alice.id]
+
+
+def test_upsert_and_discard_leave_dead_entries_behind():
+    first, second = _task("P2", 1000.0), _task("P2", 2000.0)
+    index = PriorityIndex(WEIGHTS)
+    index.load([first, second], watermark=1)
+
+    index.upsert(second.id, "P0", 2000.0, None)
+    assert index.top(10) == [second.id, first.id]
+    assert index.stats()["dead_entries"] == 2
+
+    index.discard(first.id)
+    index.discard(first.id)  # already gone: no-op
+    assert index.top(10) == [second.id]
+    assert len(index) == 1
+    assert index.stats()["dead_entries"] == 4
+
+
+def test_compaction_keeps_the_same_answers():
+    rng = random.Random(3)
+    tasks = {}
+    index = PriorityIndex(WEIGHTS)
+    for _ in range(3000):
+        task = _task(rng.choice(list(WEIGHTS)), rng.random() * 1e6, rng.choice(["alice", "bob", None]))
+        tasks[task.id] = task
+    index.load(tasks.values(), watermark=1)
+
+    for task_id in rng.sample(list(tasks), 2500):
+        index.discard(task_id)
+        del tasks[task_id]
+
+    assert index.compactions >= 1
+    assert index.stats()["dead_entries"] < 2 * len(index) + 1024
+    assert index.top(100) == _expected(tasks, 100)
+    assert index.top(100, "alice") == _expected(tasks, 100, "alice")
+
+
+def test_random_updates_match_a_full_sort():
+    rng = random.Random(11)
+    tasks = {}
+    index = PriorityIndex(WEIGHTS)
+    index.load([], watermark=1)
+    for _ in range(5000):
+        if tasks and rng.random() < 0.3:
+            task_id = rng.choice(list(tasks))
+            index.discard(task_id)
+            del tasks[task_id]
+            continue
+        if tasks and rng.random() < 0.5:
+            task = tasks[rng.choice(list(tasks))]
+            task.priority, task.ordering_index = rng.choice(list(WEIGHTS)), rng.random() * 1e6
+            task.owner = rng.choice(["alice", "bob", None])
+        else:
+            task = _task(rng.choice(list(WEIGHTS)), rng.random() * 1e6, rng.choice(["alice", "bob", None]))
+            tasks[task.id] = task
+        index.upsert(task.id, task.priority, task.ordering_index, task.owner)
+
+    assert len(index) == len(tasks)
+    for k in (1, 10, 200):
+        assert index.top(k) == _expected(tasks, k)
+        assert index.top(k, "bob") == _expected(tasks, k, "bob")
+
+
+def test_clear_unloads():
+    index = PriorityIndex(WEIGHTS)
+    index.load([_task("P1", 1.0)], watermark=5)
+    index.clear()
+
+    assert not index.loaded
+    assert index.top(10) == []
+    assert index.stats()["seconds_since_sync"] is None
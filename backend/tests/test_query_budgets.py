@@ -0,0 +1,169 @@
+import uuid
+
+from fastapi.routing import APIRoute
+
+from app.main import app
+
+# SQL statements each route may run per request. Raising a route's
+# @query_budget means raising it here too, where review sees it.
+BUDGETS = {
+    "POST /api/auth/signup": 4,
+    "POST /api/auth/login": 2,
+    "POST /api/auth/logout": 0,
+    "GET /api/auth/me": 1,
+    "GET /api/auth/users": 2,
+    "GET /api/tasks/": 2,
+    "GET /api/tasks/board": 4,
+    "GET /api/tasks/changes": 3,
+    "GET /api/tasks/columns/{column}": 2,
+    "POST /api/tasks/": 7,
+    # The compare-and-swap UPDATE, the activity write, NOTIFY at commit and
+    # the board revision after it, plus the caller's principal when it is
+    # not cached yet
+    "PATCH /api/tasks/{task_id}": 5,
+    "POST /api/tasks/{task_id}/reorder": 5,
+    "POST /api/tasks/{task_id}/move": 8,
+    "POST /api/tasks/bulk": 6,
+    "DELETE /api/tasks/{task_id}": 10,
+    "GET /api/activities/": 2,
+    "GET /api/activities/task/{task_id}": 2,
+    "GET /api/comments/task/{task_id}": 2,
+    "POST /api/comments/task/{task_id}": 5,
+    "GET /api/queue/next": 5,
+    "POST /api/queue/claim": 2,
+    "POST /api/queue/{task_id}/heartbeat": 3,
+    "POST /api/queue/{task_id}/complete": 6,
+    "POST /api/queue/{task_id}/release": 3,
+}
+# Streams cost per row rather than per request; the rest don't query
+UNBUDGETED = {
+    "GET /api/events/stream",
+    "GET /api/export/{kind}",
+    "POST /api/import/tasks",
+    "GET /health",
+    "GET /metrics",
+    "GET /stats",
+}
+
+
+def _declared() -> dict[str, int | None]:
+    return {
+        f"{method} {route.path}": getattr(route.endpoint, "query_budget", None)
+        for route in app.routes
+        if isinstance(route, APIRoute)
+        for method in route.methods
+    }
+
+
+def test_routes_declare_the_budgets_listed_here():
+    declared = _declared()
+
+    assert {name: budget for name, budget in declared.items() if name not in UNBUDGETED} == BUDGETS
+    assert {name: declared.get(name) for name in UNBUDGETED} == dict.fromkeys(UNBUDGETED)
+
+
+def _checked(response, status: int = 200):
+    assert response.status_code == status, response.text
+    assert int(response.headers["x-query-count"]) <= int(response.headers["x-query-budget"])
+    return response
+
+
+async def _new_task(client, **fields) -> dict:
+    return _checked(await client.post("/api/tasks/", json={"title": "budget", **fields}), 201).json()
+
+
+def test_board_reads(api):
+    async def scenario(client):
+        _checked(await client.get("/api/auth/me"))
+        _checked(await client.get("/api/auth/users"))
+        _checked(await client.get("/api/tasks/"))
+        _checked(await client.get("/api/tasks/board"))
+        _checked(await client.get("/api/tasks/board", params={"exact_totals": True}))
+        _checked(await client.get("/api/tasks/columns/In Progress"))
+        changes = _checked(await client.get("/api/tasks/changes")).json()
+        _checked(await client.get("/api/tasks/changes", params={"since": changes["watermark"]}))
+
+    api(scenario)
+
+
+def test_task_edits(api):
+    async def scenario(client):
+        first, second = await _new_task(client, status="Ready"), await _new_task(client, status="Ready")
+        task = await _new_task(client)
+        url = f"/api/tasks/{task['id']}"
+
+        # A new activity, one coalesced into it, and one cancelling it out
+        for priority in ("P0", "P1", "P2"):
+            task = _checked(await client.patch(url, json={"priority": priority, "if_match": task["version"]})).json()
+        task = _checked(await client.patch(url, json={"status": "Review", "if_match": task["version"]})).json()
+        reorder = {"new_status": "Ready", "new_ordering_index": 0.5, "if_match": task["version"]}
+        task = _checked(await client.post(f"{url}/reorder", json=reorder)).json()
+        # Append, after one neighbour, before one, and between two
+        for body in (
+            {},
+            {"after_id": first["id"]},
+            {"before_id": first["id"]},
+            {"after_id": first["id"], "before_id": second["id"]},
+        ):
+            task = _checked(await client.post(f"{url}/move", json={**body, "if_match": task["version"]})).json()
+        _checked(await client.post(f"{url}/move", json={"new_status": "Done", "if_match": task["version"]}))
+
+        comments = f"/api/comments/task/{task['id']}"
+        _checked(await client.post(comments, json={"body": "hi", "actor": "admin"}), 201)
+        _checked(await client.get(comments))
+        _checked(await client.delete(url), 204)
+
+    api(scenario)
+
+
+def test_patch_runs_four_statements_once_the_caller_is_cached(api):
+    async def scenario(client):
+        task = await _new_task(client)
+        edit = {"title": "renamed", "if_match": task["version"]}
+        response = _checked(await client.patch(f"/api/tasks/{task['id']}", json=edit))
+        return int(response.headers["x-query-count"])
+
+    assert api(scenario) == 4
+
+
+def test_bulk_updates(api):
+    async def scenario(client):
+        tasks = [await _new_task(client) for _ in range(3)]
+        ids = [task["id"] for task in tasks]
+        _checked(await client.post("/api/tasks/bulk", json={"task_ids": ids, "priority": "P1"}))
+        missing = str(uuid.uuid4())
+        _checked(await client.post("/api/tasks/bulk", json={"task_ids": [*ids, missing], "status": "Review"}))
+        _checked(await client.post("/api/tasks/bulk", json={"task_ids": ids, "delete": True}))
+
+    api(scenario)
+
+
+def test_activity_feeds_page_within_budget(api):
+    async def scenario(client):
+        task = await _new_task(client)
+        for body in ("a", "b", "c"):
+            _checked(await client.post(f"/api/comments/task/{task['id']}", json={"body": body, "actor": "admin"}), 201)
+        for url in ("/api/activities/", f"/api/activities/task/{task['id']}"):
+            response = _checked(await client.get(url, params={"limit": 1}))
+            _checked(await client.get(url, params={"limit": 1, "cursor": response.headers["x-next-cursor"]}))
+
+    api(scenario)
+
+
+def test_work_queue(api):
+    async def scenario(client):
+        await _new_task(client, status="Ready", priority="P0")
+        await _new_task(client, status="Ready", priority="P0")
+        _checked(await client.get("/api/queue/next"))
+        _checked(await client.get("/api/queue/next", params={"owner": "admin"}))
+
+        claim = _checked(await client.post("/api/queue/claim", json={})).json()
+        base, lease = f"/api/queue/{claim['task_id']}", {"lease_token": claim["lease_token"]}
+        _checked(await client.post(f"{base}/heartbeat", json=lease))
+        _checked(await client.post(f"{base}/complete", json={**lease, "status": "Review"}))
+
+        claim = _checked(await client.post("/api/queue/claim", json={})).json()
+        release = {"lease_token": claim["lease_token"]}
+        _checked(await client.post(f"/api/queue/{claim['task_id']}/release", json=release), 204)
+
+    api(scenario)